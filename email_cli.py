@@ -5,6 +5,8 @@ Provides direct access to all MCP server tools via command line flags
 """
 
 import argparse
+import contextlib
+import io
 import json
 import sys
 from datetime import datetime
@@ -12,7 +14,9 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 # Add src to path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+src_path = str(Path(__file__).parent / "src")
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 from email_parser.parser import EmailParser
 from email_parser.ai_integration import create_ai_analyzer
@@ -40,9 +44,15 @@ Examples:
   %(prog)s server --mcp                    # Start MCP server
   %(prog)s server --http --port 8000       # Start HTTP server
   %(prog)s server --websocket --port 8001  # Start WebSocket server
+
+  # Batch mode: one JSON argument list per stdin line, one JSON result per line
+  echo '["extract-entities", "--text", "Call 555-123-4567"]' | %(prog)s --batch
         """
     )
     
+    parser.add_argument("--batch", action="store_true",
+                        help="Read JSON argument lists from stdin and write one JSON result per line")
+    
     # Create subparsers
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
@@ -742,10 +752,49 @@ class EmailCLI:
             "low_correlation_count": len([c for c in correlations if c < 0.3])
         }
 
-def main():
+def run_batch():
+    """Run newline-delimited JSON argument lists from stdin in this process"""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        stdout, stderr = io.StringIO(), io.StringIO()
+        try:
+            argv = json.loads(line)
+            if not isinstance(argv, list) or "--batch" in argv:
+                raise ValueError
+        except ValueError:
+            argv = None
+            stderr.write("Batch commands must be JSON lists of CLI arguments\n")
+            returncode = 1
+        
+        if argv is not None:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    main([str(arg) for arg in argv])
+                    returncode = 0
+                except SystemExit as e:
+                    returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+                except Exception as e:
+                    # Report the failure for this command and carry on with the batch
+                    print(f"Error: {e}", file=sys.stderr)
+                    returncode = 1
+        
+        print(json.dumps({
+            "returncode": returncode,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue()
+        }), flush=True)
+
+def main(argv=None):
     """Main CLI entry point"""
     arg_parser = setup_parser()
-    args = arg_parser.parse_args()
+    args = arg_parser.parse_args(argv)
+    
+    if args.batch:
+        run_batch()
+        return
     
     if not args.command:
         arg_parser.print_help()
@@ -2,7 +2,7 @@
 Email Parsing MCP Server Package
 """
 
-from .parser import EmailParser, EmailContent
+from .parser import EmailParser, EmailContent, EmailAnalysis
 
 __version__ = "1.0.0"
-__all__ = ["EmailParser", "EmailContent"]
+__all__ = ["EmailParser", "EmailContent", "EmailAnalysis"]
@@ -6,6 +6,7 @@ Provides email parsing capabilities through Model Context Protocol
 import asyncio
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
@@ -68,13 +69,15 @@ class EmailParserMCPServer:
                 return {"error": str(e)}
         
         @self.mcp.tool()
-        def parse_email_folder(folder_path: str, output_format: str = "summary") -> Dict[str, Any]:
+        def parse_email_folder(folder_path: str, output_format: str = "summary",
+                               max_workers: Optional[int] = None) -> Dict[str, Any]:
             """
             Parse all .msg files in a folder and return structured results.
             
             Args:
                 folder_path: Path to folder containing .msg files
                 output_format: Output format - "summary", "detailed", or "json"
+                max_workers: Number of worker processes (defaults to CPU count, capped at it)
                 
             Returns:
                 Batch processing results with statistics and parsed emails
@@ -102,9 +105,18 @@ class EmailParserMCPServer:
                 
                 total_correlation = 0.0
                 
-                for msg_file in msg_files:
+                # max_workers may come from a remote client; keep it within 1..CPU count
+                if max_workers is not None:
+                    try:
+                        max_workers = int(max_workers)
+                    except (TypeError, ValueError):
+                        return {"error": f"max_workers must be an integer, got {max_workers!r}"}
+                    max_workers = max(1, min(max_workers, os.cpu_count() or 1))
+                
+                parsed = self.parser.parse_msg_files(msg_files, max_workers=max_workers)
+                
+                for msg_file, email_content in zip(msg_files, parsed):
                     try:
-                        email_content = self.parser.parse_msg_file(msg_file)
                         if email_content:
                             results["processed"] += 1
                             total_correlation += email_content.correlation_score
@@ -508,9 +520,9 @@ Use the parse_email_file tool to extract and analyze the email content.
             "message_id": email_content.message_id,
             "subject": email_content.subject,
             "sender": email_content.sender,
-            "recipients": email_content.recipients,
-            "cc_recipients": email_content.cc_recipients,
-            "bcc_recipients": email_content.bcc_recipients,
+            "recipients": list(email_content.recipients),
+            "cc_recipients": list(email_content.cc_recipients),
+            "bcc_recipients": list(email_content.bcc_recipients),
             "sent_date": email_content.sent_date.isoformat() if email_content.sent_date else None,
             "body_text": email_content.body_text,
             "body_html": email_content.body_html,
@@ -6,11 +6,18 @@ categorizing emails, and generating standardized formats.
 """
 
 import logging
+import mmap
+import multiprocessing
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, ClassVar, Dict, Iterable, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, field
 from email.utils import parsedate_to_datetime
 
 try:
@@ -19,17 +26,174 @@ except ImportError:
     print("Warning: extract_msg not installed. Install with: uv pip install extract-msg")
     extract_msg = None
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Falls back to a single stdlib regex scan
+
+try:
+    import re2
+except ImportError:
+    re2 = None  # Entity patterns use the stdlib re engine
+
 logger = logging.getLogger(__name__)
 
+# Every phone, date and money pattern needs at least one digit to match
+_DIGIT_RE = re.compile(r'\d')
+
+# Literal an entity type can't match without; types not listed need a digit
+_ENTITY_LITERALS = {'emails': '@', 'urls': '://'}
+
+def _compile_entity_regex(pattern: str):
+    """Compile a case-insensitive entity pattern, on RE2's linear-time engine when installed"""
+    if re2 is not None:
+        try:
+            return re2.compile(f"(?i){pattern}")
+        except Exception as e:
+            logger.debug(f"RE2 rejected entity pattern, using re: {e}")
+    return re.compile(pattern, re.IGNORECASE)
+
+# Action item phrasings folded into one alternation so the body is scanned once
+_ACTION_RE = re.compile(
+    r'(?:(?:please|could you|can you|need to|must|should)\s+(?P<request>.+?)(?:[.!?]|$))'
+    r'|(?:action\s*(?:item|required):\s*(?P<action>.+?)(?:[.!?]|$))'
+    r'|(?:to\s*do:\s*(?P<todo>.+?)(?:[.!?]|$))',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+# Worker processes are started from a clean server process rather than forked from
+# the caller, which may be a multi-threaded web server
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Summary/key point/action item heuristics only look at the start of the body
+_SCAN_LIMIT = 16 * 1024
+
+
+# Maps every ASCII non-word character to a space so str.split() tokenizes ASCII text
+# in one C-level pass, giving the same words as re.findall(r'\w+', text)
+_PUNCT_TABLE = str.maketrans({
+    chr(c): ' ' for c in range(128) if not (chr(c).isalnum() or chr(c) == '_')
+})
+
+# Non-ASCII text (’ “ ” — … and friends) goes through the regex instead, which is
+# faster than a per-character Unicode translate
+_WORD_RE = re.compile(r'\w+')
+
+
+# Recipient lists may mix ',' and ';' separators; fold them into one
+_RECIPIENT_SEP_TABLE = str.maketrans(';', ',')
+
+
+def _tokenize(text: str) -> Set[str]:
+    """Lowercase word set used for correlation scoring"""
+    return _tokenize_lower(text.lower())
+
+
+def _tokenize_lower(text: str) -> Set[str]:
+    """Word set of text that is already lowercase"""
+    if text.isascii():
+        return set(text.translate(_PUNCT_TABLE).split())
+    return set(_WORD_RE.findall(text))
+
+
+_CATEGORY_KEYWORDS = {
+    'meeting': ['meeting', 'conference', 'call', 'appointment', 'schedule'],
+    'invoice': ['invoice', 'bill', 'payment', 'amount due', 'billing'],
+    'report': ['report', 'analysis', 'summary', 'findings', 'results'],
+    'urgent': ['urgent', 'asap', 'immediate', 'critical', 'emergency'],
+    'follow_up': ['follow up', 'followup', 'reminder', 'checking in'],
+    'contract': ['contract', 'agreement', 'terms', 'legal', 'signature'],
+    'support': ['help', 'support', 'issue', 'problem', 'assistance'],
+}
+
+_PRIORITY_KEYWORDS = {
+    'high': ['urgent', 'asap', 'immediate', 'critical', 'emergency', 'high priority'],
+    'medium': ['important', 'soon', 'reminder', 'follow up'],
+    'deadline': ['deadline', 'due date', 'expires', 'by end of day', 'eod'],
+}
+
+
+def _keyword_labels(table: Dict[Any, List[str]]) -> Dict[str, Tuple[Any, ...]]:
+    """Invert a label -> keywords table; a keyword may belong to several labels"""
+    # e.g. 'urgent' is both a category and a priority
+    labels: Dict[str, Tuple[Any, ...]] = {}
+    for label, keywords in table.items():
+        for keyword in keywords:
+            labels[keyword] = labels.get(keyword, ()) + (label,)
+    return labels
+
+
+def _build_automaton_matcher(table: Dict[Any, List[str]]) -> Callable[[str], Set[Any]]:
+    """One-pass keyword matcher on a pyahocorasick automaton"""
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_labels in _keyword_labels(table).items():
+        automaton.add_word(keyword, keyword_labels)
+    automaton.make_automaton()
+    return lambda text: {label for _, found in automaton.iter(text) for label in found}
+
+
+def _build_regex_matcher(table: Dict[Any, List[str]]) -> Callable[[str], Set[Any]]:
+    """One-pass keyword matcher on a regex alternation"""
+    labels = _keyword_labels(table)
+    # Zero-width lookahead reports overlapping keywords too, like Aho-Corasick does
+    pattern = re.compile(
+        '(?=(' + '|'.join(re.escape(k) for k in sorted(labels, key=len, reverse=True)) + '))'
+    )
+    return lambda text: {label for m in pattern.finditer(text) for label in labels[m.group(1)]}
+
+
+def _build_keyword_matcher(table: Dict[Any, List[str]]) -> Callable[[str], Set[Any]]:
+    """Build a one-pass matcher returning the labels whose keywords occur in a text"""
+    if ahocorasick is not None:
+        return _build_automaton_matcher(table)
+    return _build_regex_matcher(table)
+
+
+_match_categories = _build_keyword_matcher(_CATEGORY_KEYWORDS)
+_match_priorities = _build_keyword_matcher(_PRIORITY_KEYWORDS)
+# Categories and priorities together, labelled ('category', name) / ('priority', name)
+_KEYWORD_TABLE = {
+    **{('category', label): keywords for label, keywords in _CATEGORY_KEYWORDS.items()},
+    **{('priority', label): keywords for label, keywords in _PRIORITY_KEYWORDS.items()},
+}
+_match_keywords = _build_keyword_matcher(_KEYWORD_TABLE)
+
+
+def _split_filename(filename: Optional[str]) -> Tuple[str, str]:
+    """Return the lowercase filename and its extension (without the dot)"""
+    name = (filename or '').lower()
+    ext = name.rsplit('.', 1)[-1] if '.' in name else ''
+    return name, ext
+
+
+def _attachment_name(att: Dict[str, Any]) -> Tuple[str, str]:
+    """Lowercase filename and extension, preferring the values cached at extraction"""
+    if 'filename_lower' in att:
+        return att['filename_lower'], att.get('ext', '')
+    return _split_filename(att.get('filename', ''))
+
+
+def _iter_sentences(text: str):
+    """Yield sentences lazily, matching re.split(r'[.!?]+', text)"""
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
 @dataclass
 class EmailContent:
     """Standardized email content structure"""
     message_id: str
     subject: str
     sender: str
-    recipients: List[str]
-    cc_recipients: List[str]
-    bcc_recipients: List[str]
+    recipients: Tuple[str, ...]
+    cc_recipients: Tuple[str, ...]
+    bcc_recipients: Tuple[str, ...]
     sent_date: Optional[datetime]
     body_text: str
     body_html: str
@@ -40,31 +204,73 @@ class EmailContent:
     extracted_entities: Dict[str, List[str]]
     standardized_format: Dict[str, Any]
 
+@dataclass(slots=True)
+class EmailAnalysis:
+    """Content analysis of one email, as produced by EmailParser.analyze"""
+    extracted_entities: Dict[str, List[str]]
+    correlation_score: float
+    categories: List[str]
+    standardized_format: Dict[str, Any]
+
+@dataclass(slots=True)
+class AttachmentStats:
+    """Running totals over an email's attachments"""
+    count: int = 0
+    total_size: int = 0
+    types: Set[str] = field(default_factory=set)
+    
+    def add(self, filename: str, size: int) -> None:
+        self.count += 1
+        if filename:
+            self.types.add(filename.split('.')[-1].lower() if '.' in filename else 'unknown')
+        self.total_size += size or 0
+
 class EmailParser:
     """Main email parsing engine"""
     
-    def __init__(self):
+    # Fixed and improved regex patterns, shared by every instance
+    ENTITY_PATTERNS: ClassVar[Dict[str, str]] = {
+        'emails': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',
+        'phones': r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
+        'dates': r'\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b',
+        'urls': r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?',
+        'money': r'(?:\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?|\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*(?:USD|EUR|GBP|dollars?))',
+    }
+    _COMPILED_PATTERNS: ClassVar[Dict[str, re.Pattern]] = {
+        name: _compile_entity_regex(pattern) for name, pattern in ENTITY_PATTERNS.items()
+    }
+    # Bytes twins of the patterns for scanning memory-mapped files
+    _BYTES_PATTERNS: ClassVar[Dict[str, re.Pattern]] = {
+        name: re.compile(pattern.encode(), re.IGNORECASE) for name, pattern in ENTITY_PATTERNS.items()
+    }
+    
+    def __init__(self, scan_limit: Optional[int] = _SCAN_LIMIT):
         self.supported_extensions = ['.msg']
-        # Fixed and improved regex patterns
-        self.entity_patterns = {
-            'emails': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',
-            'phones': r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
-            'dates': r'\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b',
-            'urls': r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?',
-            'money': r'(?:\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?|\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*(?:USD|EUR|GBP|dollars?))',
-        }
+        # Max body characters scanned by the heuristics (None scans the full body)
+        self.scan_limit = scan_limit
+        self.entity_patterns = self.ENTITY_PATTERNS
+        self._compiled_patterns = self._COMPILED_PATTERNS
     
     def parse_msg_file(self, file_path: Path) -> Optional[EmailContent]:
         """Parse a .msg file and extract content"""
+        return self._parse_msg(str(file_path), str(file_path), file_path.name)
+    
+    def parse_msg_stream(self, stream: Union[BinaryIO, bytes], name: str = "") -> Optional[EmailContent]:
+        """Parse .msg content from bytes or a binary file-like object without touching disk"""
+        return self._parse_msg(stream, name or "<stream>", name)
+    
+    def _parse_msg(self, source: Union[str, BinaryIO, bytes], label: str,
+                   file_name: str) -> Optional[EmailContent]:
+        """Parse a .msg message from a path, raw bytes or a binary stream"""
         if extract_msg is None:
             logger.error("extract_msg not available. Cannot parse .msg files.")
             return None
             
         try:
-            logger.info(f"Parsing email file: {file_path}")
+            logger.info(f"Parsing email file: {label}")
             
-            # Extract message using extract_msg
-            msg = extract_msg.Message(str(file_path))
+            # Extract message using extract_msg (accepts a path, bytes or file-like object)
+            msg = extract_msg.Message(source)
             
             # Extract basic information
             subject = msg.subject or ""
@@ -89,25 +295,13 @@ class EmailParser:
             body_html = getattr(msg, 'htmlBody', '') or ""
             
             # Extract attachments
-            attachments = self._extract_attachments(msg)
-            
-            # Extract entities from text
-            combined_text = f"{subject} {body_text}"
-            extracted_entities = self._extract_entities(combined_text)
+            attachments, attachment_stats = self._extract_attachments(msg)
             
-            # Calculate correlation score
-            correlation_score = self._calculate_correlation(subject, body_text, attachments)
-            
-            # Categorize email
-            categories = self._categorize_email(subject, body_text, attachments)
-            
-            # Create standardized format
-            standardized_format = self._create_standardized_format(
-                subject, body_text, attachments, extracted_entities
-            )
+            # Entities, correlation, categories and standardized format
+            analysis = self.analyze(subject, body_text, attachments, attachment_stats)
             
             email_content = EmailContent(
-                message_id=getattr(msg, 'messageId', '') or str(file_path.name),
+                message_id=getattr(msg, 'messageId', '') or file_name,
                 subject=subject,
                 sender=sender,
                 recipients=recipients,
@@ -118,79 +312,177 @@ class EmailParser:
                 body_html=body_html,
                 attachments=attachments,
                 priority=getattr(msg, 'importance', 'normal'),
-                categories=categories,
-                correlation_score=correlation_score,
-                extracted_entities=extracted_entities,
-                standardized_format=standardized_format
+                categories=analysis.categories,
+                correlation_score=analysis.correlation_score,
+                extracted_entities=analysis.extracted_entities,
+                standardized_format=analysis.standardized_format
             )
             
             logger.info(f"Successfully parsed email: {subject[:50]}...")
             return email_content
             
         except Exception as e:
-            logger.error(f"Error parsing {file_path}: {str(e)}")
+            logger.error(f"Error parsing {label}: {str(e)}")
             return None
     
-    def _parse_recipients(self, recipients_str: Optional[str]) -> List[str]:
-        """Parse recipients string into list"""
+    def parse_msg_files(self, paths: Iterable[Union[str, Path]],
+                        max_workers: Optional[int] = None) -> List[Optional[EmailContent]]:
+        """Parse several .msg files in parallel, preserving input order"""
+        paths = [str(p) for p in paths]
+        if len(paths) <= 1 or max_workers == 1:
+            return [self._parse_or_none(p) for p in paths]
+        
+        # Each file is independent, so fan out across worker processes
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=_POOL_CONTEXT) as executor:
+            worker = partial(_top_level_parse, parser_cls=type(self), scan_limit=self.scan_limit)
+            futures = [executor.submit(worker, p) for p in paths]
+            results = []
+            for path, future in zip(paths, futures):
+                try:
+                    results.append(future.result())
+                except BrokenProcessPool as e:
+                    # The pool is gone; parse this file in-process instead
+                    logger.warning(f"Worker pool failed ({e}), parsing {path} in-process")
+                    results.append(self._parse_or_none(path))
+                except Exception as e:
+                    logger.error(f"Error parsing {path}: {e}")
+                    results.append(None)
+            return results
+    
+    def _parse_or_none(self, path: str) -> Optional[EmailContent]:
+        """Parse one file for a batch, recording a failure as None"""
+        try:
+            return self.parse_msg_file(Path(path))
+        except Exception as e:
+            logger.error(f"Error parsing {path}: {e}")
+            return None
+    
+    def analyze(self, subject: str, body: str, attachments: List[Dict[str, Any]],
+                attachment_stats: Optional[AttachmentStats] = None) -> EmailAnalysis:
+        """Run all content analysis for an email, sharing work between the steps"""
+        # The combined text is built once, for entities, and lowercased once, for the rest
+        content = f"{subject} {body}"
+        lowered = content.lower()
+        if len(lowered) == len(content):
+            # lower() never shortens a character, so equal lengths mean the offsets line up
+            subject_lower, body_lower = lowered[:len(subject)], lowered[len(subject) + 1:]
+        else:
+            subject_lower, body_lower = subject.lower(), body.lower()
+        
+        extracted_entities = self._extract_entities(content)
+        
+        # One keyword scan serves both categories and priorities
+        hits = _match_keywords(lowered)
+        categories = self._categories_from_hits({label for kind, label in hits if kind == 'category'},
+                                                attachments)
+        priority_indicators = [priority for priority in _PRIORITY_KEYWORDS if ('priority', priority) in hits]
+        
+        correlation_score = self._correlation_from_words(
+            _tokenize_lower(subject_lower), _tokenize_lower(body_lower), attachments
+        )
+        
+        return EmailAnalysis(
+            extracted_entities=extracted_entities,
+            correlation_score=correlation_score,
+            categories=categories,
+            standardized_format=self._create_standardized_format(
+                subject, body, attachments, extracted_entities, attachment_stats,
+                priority_indicators=priority_indicators
+            ),
+        )
+    
+    def _parse_recipients(self, recipients_str: Optional[str]) -> Tuple[str, ...]:
+        """Parse recipients string into a tuple of addresses"""
         if not recipients_str:
-            return []
+            return ()
         
-        # Split by common delimiters and clean up
-        recipients = re.split(r'[;,]\s*', recipients_str)
-        return [r.strip() for r in recipients if r.strip()]
+        # Split by common delimiters and clean up; addresses repeat across emails, so intern them
+        recipients = (r.strip() for r in recipients_str.translate(_RECIPIENT_SEP_TABLE).split(','))
+        return tuple(sys.intern(r) for r in recipients if r)
     
-    def _extract_attachments(self, msg) -> List[Dict[str, Any]]:
-        """Extract attachment information"""
+    def _extract_attachments(self, msg) -> Tuple[List[Dict[str, Any]], AttachmentStats]:
+        """Extract attachment information and summary stats in a single pass"""
         attachments = []
+        stats = AttachmentStats()
         
         try:
             for attachment in msg.attachments:
+                filename = getattr(attachment, 'longFilename', '') or \
+                           getattr(attachment, 'shortFilename', '')
+                filename_lower, ext = _split_filename(filename)
                 att_info = {
-                    'filename': getattr(attachment, 'longFilename', '') or 
-                               getattr(attachment, 'shortFilename', ''),
+                    'filename': filename,
+                    'filename_lower': filename_lower,
+                    'ext': ext,
                     'size': getattr(attachment, 'size', 0),
                     'content_type': getattr(attachment, 'mimetype', ''),
                     'is_embedded': hasattr(attachment, 'cid'),
                 }
                 attachments.append(att_info)
+                stats.add(att_info['filename'], att_info['size'])
         except Exception as e:
             logger.warning(f"Error extracting attachments: {e}")
         
-        return attachments
+        return attachments, stats
     
     def _extract_entities(self, text: str) -> Dict[str, List[str]]:
         """Extract entities from text using regex patterns"""
         entities = {}
+        has_digit = _DIGIT_RE.search(text) is not None
         
-        for entity_type, pattern in self.entity_patterns.items():
+        # Each type is scanned separately so overlapping matches (e.g. a phone
+        # number inside an email address) are all reported
+        for entity_type, pattern in self._compiled_patterns.items():
+            literal = _ENTITY_LITERALS.get(entity_type)
+            if (literal not in text) if literal else not has_digit:
+                entities[entity_type] = []  # Cheap literal screen: this type can't match
+                continue
             try:
-                matches = re.findall(pattern, text, re.IGNORECASE)
                 # Filter out empty strings and duplicates
-                entities[entity_type] = list(set([match.strip() for match in matches if match.strip()]))
+                entities[entity_type] = list({match.strip() for match in pattern.findall(text) if match.strip()})
             except Exception as e:
                 logger.warning(f"Error in pattern {entity_type}: {e}")
                 entities[entity_type] = []
         
         return entities
     
+    def extract_entities_from_file(self, file_path: Union[str, Path]) -> Dict[str, List[str]]:
+        """Extract entities from a UTF-8/ASCII text file without reading it into memory"""
+        entities = {entity_type: set() for entity_type in self._BYTES_PATTERNS}
+        
+        with open(file_path, 'rb') as f:
+            # mmap can't map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return {entity_type: [] for entity_type in entities}
+            # The regexes scan the page-cached file directly instead of a decoded copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for entity_type, pattern in self._BYTES_PATTERNS.items():
+                    for match in pattern.finditer(mm):
+                        value = match.group().strip()
+                        if value:
+                            entities[entity_type].add(value.decode('utf-8', 'replace'))
+        
+        return {entity_type: list(values) for entity_type, values in entities.items()}
+    
     def _calculate_correlation(self, subject: str, body: str, attachments: List[Dict]) -> float:
         """Calculate correlation score between subject, body, and attachments"""
+        return self._correlation_from_words(_tokenize(subject), _tokenize(body), attachments)
+    
+    def _correlation_from_words(self, subject_words: Set[str], body_words: Set[str],
+                                attachments: List[Dict]) -> float:
+        """Correlation score from already tokenized subject and body words"""
         score = 0.0
         
         # Subject-body correlation
-        subject_words = set(re.findall(r'\w+', subject.lower()))
-        body_words = set(re.findall(r'\w+', body.lower()))
-        
         if subject_words and body_words:
             common_words = subject_words.intersection(body_words)
             score += len(common_words) / max(len(subject_words), len(body_words))
         
         # Subject-attachment correlation
         if attachments:
-            attachment_names = [att.get('filename', '').lower() for att in attachments]
-            for name in attachment_names:
-                name_words = set(re.findall(r'\w+', name))
+            for att in attachments:
+                name = _attachment_name(att)[0]
+                name_words = _tokenize_lower(name)  # cached name is already lowercase
                 if name_words and subject_words:
                     common = name_words.intersection(subject_words)
                     score += len(common) / len(subject_words) * 0.5  # Weight attachment correlation less
@@ -199,23 +491,13 @@ class EmailParser:
     
     def _categorize_email(self, subject: str, body: str, attachments: List[Dict]) -> List[str]:
         """Categorize email based on content"""
-        categories = []
         content = f"{subject} {body}".lower()
-        
-        # Define category keywords
-        category_keywords = {
-            'meeting': ['meeting', 'conference', 'call', 'appointment', 'schedule'],
-            'invoice': ['invoice', 'bill', 'payment', 'amount due', 'billing'],
-            'report': ['report', 'analysis', 'summary', 'findings', 'results'],
-            'urgent': ['urgent', 'asap', 'immediate', 'critical', 'emergency'],
-            'follow_up': ['follow up', 'followup', 'reminder', 'checking in'],
-            'contract': ['contract', 'agreement', 'terms', 'legal', 'signature'],
-            'support': ['help', 'support', 'issue', 'problem', 'assistance'],
-        }
-        
-        for category, keywords in category_keywords.items():
-            if any(keyword in content for keyword in keywords):
-                categories.append(category)
+        return self._categories_from_hits(_match_categories(content), attachments)
+    
+    def _categories_from_hits(self, hits: Set[str], attachments: List[Dict]) -> List[str]:
+        """Build the category list from matched keyword labels plus attachment types"""
+        # Reported in keyword table order
+        categories = [category for category in _CATEGORY_KEYWORDS if category in hits]
         
         # Check for attachments
         if attachments:
@@ -223,19 +505,23 @@ class EmailParser:
             
             # Specific attachment types
             for att in attachments:
-                filename = att.get('filename', '').lower()
-                if filename.endswith(('.pdf', '.doc', '.docx')):
+                ext = _attachment_name(att)[1]
+                if ext in ('pdf', 'doc', 'docx'):
                     categories.append('document')
-                elif filename.endswith(('.jpg', '.png', '.gif', '.bmp')):
+                elif ext in ('jpg', 'png', 'gif', 'bmp'):
                     categories.append('image')
-                elif filename.endswith(('.xls', '.xlsx', '.csv')):
+                elif ext in ('xls', 'xlsx', 'csv'):
                     categories.append('spreadsheet')
         
         return categories or ['general']
     
     def _create_standardized_format(self, subject: str, body: str, 
-                                  attachments: List[Dict], entities: Dict) -> Dict[str, Any]:
+                                  attachments: List[Dict], entities: Dict,
+                                  attachment_stats: Optional[AttachmentStats] = None,
+                                  priority_indicators: Optional[List[str]] = None) -> Dict[str, Any]:
         """Create standardized format for the email"""
+        if priority_indicators is None:
+            priority_indicators = self._identify_priority_indicators(subject, body)
         return {
             'summary': self._generate_summary(subject, body),
             'key_points': self._extract_key_points(body),
@@ -243,15 +529,21 @@ class EmailParser:
             'mentioned_people': entities.get('emails', []),
             'mentioned_dates': entities.get('dates', []),
             'mentioned_amounts': entities.get('money', []),
-            'attachment_summary': self._summarize_attachments(attachments),
-            'priority_indicators': self._identify_priority_indicators(subject, body),
+            'attachment_summary': self._summarize_attachments(attachments, attachment_stats),
+            'priority_indicators': priority_indicators,
         }
     
+    def _scan_window(self, body: str) -> str:
+        """Return the part of the body the text heuristics should look at"""
+        if self.scan_limit is None:
+            return body
+        return body[:self.scan_limit]
+    
     def _generate_summary(self, subject: str, body: str) -> str:
         """Generate a brief summary of the email"""
+        body = self._scan_window(body)
         # Simple extractive summary - take first sentence of body
-        sentences = re.split(r'[.!?]+', body.strip())
-        first_sentence = sentences[0].strip() if sentences else ""
+        first_sentence = next(_iter_sentences(body.strip())).strip()
         
         if len(first_sentence) > 100:
             first_sentence = first_sentence[:97] + "..."
@@ -260,6 +552,7 @@ class EmailParser:
     
     def _extract_key_points(self, body: str) -> List[str]:
         """Extract key points from email body"""
+        body = self._scan_window(body)
         # Look for bullet points, numbered lists, or sentences with key indicators
         key_points = []
         
@@ -273,9 +566,9 @@ class EmailParser:
         
         # Key indicator phrases
         key_indicators = ['important', 'note that', 'please', 'action required', 'deadline']
-        sentences = re.split(r'[.!?]+', body)
-        
-        for sentence in sentences:
+        for sentence in _iter_sentences(body):
+            if len(key_points) >= 5:
+                break
             if any(indicator in sentence.lower() for indicator in key_indicators):
                 clean_sentence = sentence.strip()
                 if clean_sentence and len(clean_sentence) > 10:  # Avoid very short fragments
@@ -285,53 +578,51 @@ class EmailParser:
     
     def _extract_action_items(self, body: str) -> List[str]:
         """Extract action items from email body"""
+        body = self._scan_window(body)
         action_items = []
-        action_patterns = [
-            r'(?:please|could you|can you|need to|must|should)\s+(.+?)(?:[.!?]|$)',
-            r'action\s*(?:item|required):\s*(.+?)(?:[.!?]|$)',
-            r'to\s*do:\s*(.+?)(?:[.!?]|$)',
-        ]
         
-        for pattern in action_patterns:
-            matches = re.findall(pattern, body, re.IGNORECASE | re.MULTILINE)
-            action_items.extend([match.strip() for match in matches if match.strip()])
+        for match in _ACTION_RE.finditer(body):
+            item = match.group(match.lastindex).strip()
+            if item:
+                action_items.append(item)
+                if len(action_items) == 3:  # Limit to top 3
+                    break
         
-        return action_items[:3]  # Limit to top 3
+        return action_items
     
-    def _summarize_attachments(self, attachments: List[Dict]) -> str:
+    def _summarize_attachments(self, attachments: List[Dict],
+                               stats: Optional[AttachmentStats] = None) -> str:
         """Create a summary of attachments"""
         if not attachments:
             return "No attachments"
         
-        count = len(attachments)
-        types = set()
-        total_size = 0
-        
-        for att in attachments:
-            filename = att.get('filename', '')
-            if filename:
-                ext = filename.split('.')[-1].lower() if '.' in filename else 'unknown'
-                types.add(ext)
-            total_size += att.get('size', 0)
+        # Reuse the totals gathered during extraction when available
+        if stats is None:
+            stats = AttachmentStats()
+            for att in attachments:
+                stats.add(att.get('filename', ''), att.get('size', 0))
         
-        size_mb = total_size / (1024 * 1024) if total_size > 0 else 0
+        count = stats.count
+        size_mb = stats.total_size / (1024 * 1024) if stats.total_size > 0 else 0
         
         return f"{count} attachment{'s' if count > 1 else ''} " \
-               f"({', '.join(sorted(types))}) - {size_mb:.1f} MB total"
+               f"({', '.join(sorted(stats.types))}) - {size_mb:.1f} MB total"
     
     def _identify_priority_indicators(self, subject: str, body: str) -> List[str]:
         """Identify priority indicators in the email"""
-        indicators = []
         content = f"{subject} {body}".lower()
         
-        priority_keywords = {
-            'high': ['urgent', 'asap', 'immediate', 'critical', 'emergency', 'high priority'],
-            'medium': ['important', 'soon', 'reminder', 'follow up'],
-            'deadline': ['deadline', 'due date', 'expires', 'by end of day', 'eod'],
-        }
-        
-        for priority, keywords in priority_keywords.items():
-            if any(keyword in content for keyword in keywords):
-                indicators.append(priority)
-        
-        return indicators
\ No newline at end of file
+        hits = _match_priorities(content)
+        return [priority for priority in _PRIORITY_KEYWORDS if priority in hits]
+
+
+@lru_cache(maxsize=None)
+def _worker_parser(parser_cls: type, scan_limit: Optional[int]) -> EmailParser:
+    """One parser per worker process, reused for every file it handles"""
+    return parser_cls(scan_limit=scan_limit)
+
+
+def _top_level_parse(path: str, parser_cls: type = EmailParser,
+                     scan_limit: Optional[int] = _SCAN_LIMIT) -> Optional[EmailContent]:
+    """Process pool entry point - must be module level to be picklable"""
+    return _worker_parser(parser_cls, scan_limit).parse_msg_file(Path(path))
@@ -6,22 +6,62 @@ Provides HTTP and WebSocket support for remote clients
 import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from pathlib import Path
+from types import MappingProxyType
 
 try:
     import uvicorn
     from fastapi import FastAPI, WebSocket, HTTPException
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import JSONResponse, ORJSONResponse
 except ImportError:
     print("Warning: FastAPI/uvicorn not installed. Install with: uv pip install fastapi uvicorn")
     FastAPI = None
 
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _dumps = json.dumps
+    _loads = json.loads
+
 from .mcp_server import EmailParserMCPServer
 
 logger = logging.getLogger(__name__)
 
+# WebSocket actions mapped to MCP tools
+_WS_TOOL_MAPPING = MappingProxyType({
+    "parse_file": "parse_email_file",
+    "parse_folder": "parse_email_folder",
+    "analyze_patterns": "analyze_email_patterns",
+    "extract_entities": "extract_entities_from_text"
+})
+_WS_ACTIONS = tuple(_WS_TOOL_MAPPING)
+
+async def _load_tool_table(mcp_server: EmailParserMCPServer) -> Dict[str, Callable]:
+    """Resolve MCP tool callables through FastMCP's public tool API"""
+    tools = await mcp_server.mcp.get_tools()
+    return {name: tool.fn for name, tool in tools.items() if getattr(tool, "fn", None) is not None}
+
+async def _run_tool(tool_func: Callable, args: Dict[str, Any]) -> Any:
+    """Call a tool callable, awaiting it if it is (or returns) a coroutine"""
+    if asyncio.iscoroutinefunction(tool_func):
+        result = await tool_func(**args)
+    else:
+        # Tools parse files synchronously; keep them off the event loop
+        result = await asyncio.to_thread(tool_func, **args)
+    
+    # Handle sync callables that return awaitables
+    if asyncio.iscoroutine(result):
+        result = await result
+    return result
+
 class HTTPTransport:
     """HTTP transport for MCP server"""
     
@@ -30,12 +70,14 @@ class HTTPTransport:
             raise ImportError("FastAPI is required for HTTP transport. Install with: uv pip install fastapi uvicorn")
         
         self.mcp_server = mcp_server
+        self._tool_table: Optional[Dict[str, Callable]] = None  # resolved on first tool call
         self.host = host
         self.port = port
         self.app = FastAPI(
             title="Email Parser MCP Server",
             description="MCP Server for email parsing and analysis",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse if orjson is not None else JSONResponse
         )
         
         # Add CORS middleware
@@ -93,13 +135,15 @@ class HTTPTransport:
             try:
                 folder_path = request.get("folder_path")
                 output_format = request.get("output_format", "summary")
+                max_workers = request.get("max_workers")
                 
                 if not folder_path:
                     raise HTTPException(status_code=400, detail="folder_path is required")
                 
                 result = await self._call_mcp_tool("parse_email_folder", {
                     "folder_path": folder_path,
-                    "output_format": output_format
+                    "output_format": output_format,
+                    "max_workers": max_workers
                 })
                 return result
                 
@@ -145,19 +189,14 @@ class HTTPTransport:
     async def _call_mcp_tool(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """Call an MCP tool and return the result"""
         try:
-            # Access the tools from the MCP server
-            tools = self.mcp_server.mcp._tools
-            if tool_name not in tools:
-                raise ValueError(f"Tool {tool_name} not found")
+            if self._tool_table is None:
+                self._tool_table = await _load_tool_table(self.mcp_server)
             
-            tool_func = tools[tool_name].func
-            result = tool_func(**args)
-            
-            # Handle async tools if needed
-            if asyncio.iscoroutine(result):
-                result = await result
+            tool_func = self._tool_table.get(tool_name)
+            if tool_func is None:
+                raise ValueError(f"Tool {tool_name} not found")
             
-            return result
+            return await _run_tool(tool_func, args)
             
         except Exception as e:
             logger.error(f"Error calling MCP tool {tool_name}: {e}")
@@ -184,6 +223,7 @@ class WebSocketTransport:
             raise ImportError("FastAPI is required for WebSocket transport")
         
         self.mcp_server = mcp_server
+        self._tool_table: Optional[Dict[str, Callable]] = None  # resolved on first tool call
         self.host = host
         self.port = port
         self.app = FastAPI(title="Email Parser MCP WebSocket Server")
@@ -204,13 +244,13 @@ class WebSocketTransport:
                 while True:
                     # Receive message from client
                     message = await websocket.receive_text()
-                    request_data = json.loads(message)
+                    request_data = _loads(message)
                     
                     # Process the request
                     response = await self._process_websocket_request(request_data)
                     
                     # Send response back
-                    await websocket.send_text(json.dumps(response))
+                    await websocket.send_text(_dumps(response))
                     
             except Exception as e:
                 logger.error(f"WebSocket error for client {client_id}: {e}")
@@ -233,22 +273,14 @@ class WebSocketTransport:
             params = request_data.get("params", {})
             request_id = request_data.get("request_id")
             
-            # Map actions to MCP tools
-            tool_mapping = {
-                "parse_file": "parse_email_file",
-                "parse_folder": "parse_email_folder",
-                "analyze_patterns": "analyze_email_patterns",
-                "extract_entities": "extract_entities_from_text"
-            }
-            
-            if action not in tool_mapping:
+            tool_name = _WS_TOOL_MAPPING.get(action)
+            if tool_name is None:
                 return {
                     "request_id": request_id,
                     "error": f"Unknown action: {action}",
-                    "available_actions": list(tool_mapping.keys())
+                    "available_actions": _WS_ACTIONS
                 }
             
-            tool_name = tool_mapping[action]
             result = await self._call_mcp_tool(tool_name, params)
             
             return {
@@ -269,17 +301,14 @@ class WebSocketTransport:
     async def _call_mcp_tool(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """Call an MCP tool (same as HTTP transport)"""
         try:
-            tools = self.mcp_server.mcp._tools
-            if tool_name not in tools:
-                raise ValueError(f"Tool {tool_name} not found")
+            if self._tool_table is None:
+                self._tool_table = await _load_tool_table(self.mcp_server)
             
-            tool_func = tools[tool_name].func
-            result = tool_func(**args)
-            
-            if asyncio.iscoroutine(result):
-                result = await result
+            tool_func = self._tool_table.get(tool_name)
+            if tool_func is None:
+                raise ValueError(f"Tool {tool_name} not found")
             
-            return result
+            return await _run_tool(tool_func, args)
             
         except Exception as e:
             logger.error(f"Error calling MCP tool {tool_name}: {e}")
@@ -290,19 +319,24 @@ class WebSocketTransport:
         if not self.active_connections:
             return
         
-        message_text = json.dumps(message)
-        disconnected_clients = []
+        message_text = _dumps(message)
         
-        for client_id, websocket in self.active_connections.items():
+        async def _send(client_id: str, websocket: WebSocket) -> Optional[str]:
             try:
                 await websocket.send_text(message_text)
             except Exception as e:
                 logger.error(f"Failed to send message to client {client_id}: {e}")
-                disconnected_clients.append(client_id)
+                return client_id
+            return None
+        
+        # Send to all clients concurrently so one slow client doesn't delay the rest
+        disconnected_clients = await asyncio.gather(
+            *[_send(client_id, websocket) for client_id, websocket in list(self.active_connections.items())]
+        )
         
         # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            del self.active_connections[client_id]
+        for client_id in filter(None, disconnected_clients):
+            self.active_connections.pop(client_id, None)
     
     async def run(self):
         """Run the WebSocket server"""
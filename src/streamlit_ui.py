@@ -6,12 +6,26 @@ Simple, interactive web interface using Streamlit
 
 import streamlit as st
 import tempfile
+import hashlib
 import json
 import os
+import sqlite3
+import threading
+import time
+import uuid
+import shutil
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Setup page config
 st.set_page_config(
     page_title="Email Parser & Data Ingestion",
@@ -24,14 +38,166 @@ st.set_page_config(
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
-from email_parser.parser import EmailParser
-from data_ingestion.mapper import ConfigurableDataIngestionMapper
+# st.fragment needs Streamlit 1.37+ (1.33+ as experimental); older versions rerun the whole page
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda func: func)
+
+# Worker threads used to process uploaded files concurrently
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Minimum seconds between progress widget updates for large batches
+PROGRESS_INTERVAL = 0.1
+
+# .msg files are OLE2 compound documents and always start with this signature
+MSG_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+LARGE_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# Signed-in users' processing history is kept in SQLite, scoped to the user, so it
+# survives restarts and is shared across their tabs. Without sign-in there is no
+# durable identity, so history stays in the session. Both are capped per table.
+HISTORY_DB = Path.home() / ".cache" / "email-parser" / "history.db"
+HISTORY_TABLES = ('email_results', 'data_results')
+MAX_HISTORY = 200
+
+# Successful parses are cached in memory by content hash, so re-uploading a file skips parsing.
+# Bump PARSE_CACHE_VERSION whenever parsing or the EmailContent schema changes.
+PARSE_CACHE_VERSION = 2
+PARSE_CACHE_ENTRIES = 256
+PARSE_CACHE_TTL = 3600
 
-# Initialize session state
-if 'email_results' not in st.session_state:
-    st.session_state.email_results = []
-if 'data_results' not in st.session_state:
-    st.session_state.data_results = []
+@st.cache_resource
+def get_email_parser():
+    """Shared EmailParser instance, reused across reruns and sessions"""
+    # Imported lazily so tabs that don't parse never pay for the import
+    from email_parser.parser import EmailParser
+    return EmailParser()
+
+class ParseCache:
+    """Thread-safe LRU of parsed emails with a time-to-live, shared by all sessions"""
+    
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (stored at, EmailContent)
+        self._lock = threading.Lock()
+    
+    def get(self, key: str):
+        """Return the cached parse for key, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: str, email_content) -> None:
+        """Store a successful parse, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), email_content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+@st.cache_resource
+def get_parse_cache() -> ParseCache:
+    """Parsed-email cache shared across reruns and sessions"""
+    return ParseCache(PARSE_CACHE_ENTRIES, PARSE_CACHE_TTL)
+
+@st.cache_resource
+def get_mapper(config_dir: str = "config"):
+    """Shared data ingestion mapper, reused across reruns and sessions"""
+    from data_ingestion.mapper import ConfigurableDataIngestionMapper
+    return ConfigurableDataIngestionMapper(config_dir)
+
+@st.cache_resource
+def init_history_db() -> Path:
+    """Create (or migrate) the history tables once per process"""
+    HISTORY_DB.parent.mkdir(parents=True, exist_ok=True)
+    with closing(sqlite3.connect(HISTORY_DB)) as conn, conn:
+        for table in HISTORY_TABLES:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, owner TEXT NOT NULL, result TEXT NOT NULL)"
+            )
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if 'owner' not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            # Rows that don't belong to a signed-in user can't be attributed to anyone
+            conn.execute(f"DELETE FROM {table} WHERE owner NOT LIKE 'user:%'")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_owner ON {table} (owner, id)")
+    return HISTORY_DB
+
+def history_connection() -> sqlite3.Connection:
+    """Open the history database"""
+    return sqlite3.connect(init_history_db())
+
+def history_owner() -> Optional[str]:
+    """Durable owner of this session's history: the signed-in user, or None without auth"""
+    # st.user with st.login() needs Streamlit 1.42+; experimental_user isn't used since it
+    # reports a placeholder email for every local viewer
+    user = getattr(st, "user", None)
+    try:
+        email = user.get("email") if user is not None and user.get("is_logged_in") else None
+    except Exception:
+        email = None
+    return f"user:{email}" if email else None
+
+def add_to_history(table: str, results: List[Dict[str, Any]]):
+    """Store results in a history table, keeping only the newest MAX_HISTORY entries"""
+    # Stable id per result, used for widget keys
+    for result in results:
+        result.setdefault('_id', uuid.uuid4().hex)
+    
+    owner = history_owner()
+    if owner is None:
+        history = st.session_state.setdefault(table, [])
+        history.extend(results)
+        del history[:-MAX_HISTORY]
+        return
+    
+    with closing(history_connection()) as conn, conn:
+        conn.executemany(
+            f"INSERT INTO {table} (owner, result) VALUES (?, ?)",
+            [(owner, json.dumps(result)) for result in results]
+        )
+        conn.execute(
+            f"DELETE FROM {table} WHERE owner = ? AND id <= "
+            f"(SELECT id FROM {table} WHERE owner = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (owner, owner, MAX_HISTORY)
+        )
+    query_history.clear()
+
+def load_history(table: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return the newest history entries (oldest first)"""
+    owner = history_owner()
+    if owner is None:
+        return st.session_state.get(table, [])[-(limit or MAX_HISTORY):]
+    return query_history(owner, table, limit)
+
+@st.cache_data(ttl=10, show_spinner=False)
+def query_history(owner: str, table: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Read an owner's newest history rows (owner is part of the cache key)"""
+    with closing(history_connection()) as conn:
+        rows = conn.execute(
+            f"SELECT result FROM {table} WHERE owner = ? ORDER BY id DESC LIMIT ?",
+            (owner, limit or MAX_HISTORY)
+        ).fetchall()
+    return [json_loads(row[0]) for row in reversed(rows)]
+
+def clear_history(*tables: str):
+    """Delete this session's (or signed-in user's) entries from the given history tables"""
+    owner = history_owner()
+    if owner is None:
+        for table in tables:
+            st.session_state.pop(table, None)
+        return
+    
+    with closing(history_connection()) as conn, conn:
+        for table in tables:
+            conn.execute(f"DELETE FROM {table} WHERE owner = ?", (owner,))
+    query_history.clear()
 
 def main():
     """Main Streamlit application"""
@@ -84,10 +250,10 @@ def email_parser_tab():
             parse_email_files(uploaded_files)
     
     # Display recent results
-    if st.session_state.email_results:
+    if load_history('email_results', 5):
         st.markdown("---")
         st.subheader("📊 Recent Results")
-        display_email_results(st.session_state.email_results[-5:])  # Show last 5
+        email_history_fragment(limit=5, key="email_recent")  # Show last 5
 
 def data_ingestion_tab():
     """Data ingestion interface"""
@@ -127,34 +293,37 @@ def data_ingestion_tab():
             process_data_files(uploaded_files, selected_template)
     
     # Display recent results
-    if st.session_state.data_results:
+    if load_history('data_results', 5):
         st.markdown("---")
         st.subheader("📊 Recent Results")
-        display_data_results(st.session_state.data_results[-5:])  # Show last 5
+        data_history_fragment(limit=5, key="data_recent")  # Show last 5
 
 def results_history_tab():
     """Results history interface"""
     st.header("📋 Results History")
     
+    has_email_history = bool(load_history('email_results'))
+    has_data_history = bool(load_history('data_results'))
+    
     # Email results
-    if st.session_state.email_results:
+    if has_email_history:
         st.subheader("📧 Email Parsing History")
-        display_email_results(st.session_state.email_results)
+        email_history_fragment(key="email_history")
         
         if st.button("🗑️ Clear Email History"):
-            st.session_state.email_results = []
+            clear_history('email_results')
             st.rerun()
     
     # Data results
-    if st.session_state.data_results:
+    if has_data_history:
         st.subheader("📊 Data Ingestion History")
-        display_data_results(st.session_state.data_results)
+        data_history_fragment(key="data_history")
         
         if st.button("🗑️ Clear Data History"):
-            st.session_state.data_results = []
+            clear_history('data_results')
             st.rerun()
     
-    if not st.session_state.email_results and not st.session_state.data_results:
+    if not has_email_history and not has_data_history:
         st.info("📝 No processing history yet. Process some files to see results here!")
 
 def settings_tab():
@@ -191,79 +360,129 @@ def settings_tab():
     # Clear all data
     st.subheader("🗑️ Data Management")
     if st.button("Clear All Results", type="secondary"):
-        st.session_state.email_results = []
-        st.session_state.data_results = []
+        clear_history(*HISTORY_TABLES)
         st.success("All results cleared!")
         st.rerun()
 
 def parse_email_files(uploaded_files):
     """Parse uploaded email files"""
-    parser = EmailParser()
+    parser = get_email_parser()
+    
+    # Reject empty or non-.msg uploads before doing any parsing work
+    valid_files = []
+    rejected = []
+    for uploaded_file in uploaded_files:
+        error = check_msg_upload(uploaded_file)
+        if error:
+            rejected.append({
+                'filename': uploaded_file.name,
+                'status': 'error',
+                'error': error
+            })
+            continue
+        if uploaded_file.size > LARGE_UPLOAD_BYTES:
+            st.warning(f"⚠️ {uploaded_file.name} is larger than 50 MB, parsing may be slow")
+        valid_files.append(uploaded_file)
+    
+    # Cache lookups happen here on the script thread; only misses go to the worker pool
+    cache = get_parse_cache()
+    parsed = [None] * len(valid_files)
+    misses = []  # (index in valid_files, cache key)
+    for i, uploaded_file in enumerate(valid_files):
+        key = parse_cache_key(uploaded_file)
+        email_content = cache.get(key)
+        if email_content is not None:
+            parsed[i] = email_result(uploaded_file.name, email_content)
+        else:
+            misses.append((i, key))
     
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    results = []
-    
-    for i, uploaded_file in enumerate(uploaded_files):
-        status_text.text(f"Processing {uploaded_file.name}...")
-        progress_bar.progress((i + 1) / len(uploaded_files))
-        
-        try:
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.msg') as tmp_file:
-                tmp_file.write(uploaded_file.read())
-                tmp_file_path = tmp_file.name
-            
-            # Parse the email
-            email_content = parser.parse_msg_file(Path(tmp_file_path))
-            
-            if email_content:
-                result = {
-                    'filename': uploaded_file.name,
-                    'subject': email_content.subject,
-                    'sender': email_content.sender,
-                    'recipients': email_content.recipients,
-                    'date': email_content.sent_date.isoformat() if email_content.sent_date else None,
-                    'body_preview': email_content.body_text[:200] + "..." if len(email_content.body_text or "") > 200 else email_content.body_text,
-                    'categories': email_content.categories,
-                    'entities': email_content.extracted_entities,
-                    'correlation_score': email_content.correlation_score,
-                    'status': 'success'
-                }
-            else:
-                result = {
-                    'filename': uploaded_file.name,
-                    'status': 'error',
-                    'error': 'Failed to parse email file'
-                }
-            
-            results.append(result)
-            
-            # Clean up temp file
-            os.unlink(tmp_file_path)
-            
-        except Exception as e:
-            results.append({
-                'filename': uploaded_file.name,
-                'status': 'error',
-                'error': str(e)
-            })
+    miss_keys = {id(valid_files[i]): key for i, key in misses}
+    miss_results = run_in_parallel(
+        [valid_files[i] for i, _ in misses],
+        lambda uploaded_file: parse_one_email(parser, cache, miss_keys[id(uploaded_file)], uploaded_file),
+        progress_bar,
+        status_text
+    )
+    for (i, _), result in zip(misses, miss_results):
+        parsed[i] = result
+    results = rejected + parsed
     
     # Store results in session state
-    st.session_state.email_results.extend(results)
+    add_to_history('email_results', results)
     
     progress_bar.progress(1.0)
     status_text.text("✅ Processing complete!")
     
     # Show immediate results
     st.success(f"🎉 Processed {len(uploaded_files)} email files!")
-    display_email_results(results)
+    display_email_results(results, key="email_latest")
+
+def check_msg_upload(uploaded_file) -> Optional[str]:
+    """Return an error message if the upload cannot be a .msg file, else None"""
+    if uploaded_file.size == 0:
+        return 'Empty file'
+    
+    position = uploaded_file.tell()
+    magic = uploaded_file.read(len(MSG_MAGIC))
+    uploaded_file.seek(position)
+    
+    if magic != MSG_MAGIC:
+        return 'Not a valid .msg file (missing OLE2 signature)'
+    return None
+
+def parse_cache_key(uploaded_file) -> str:
+    """Parse cache key: cache version plus a hash of the upload's content"""
+    digest = hashlib.file_digest(uploaded_file, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+    uploaded_file.seek(0)
+    return f"{PARSE_CACHE_VERSION}:{digest}"
+
+def email_result(filename: str, email_content) -> Dict[str, Any]:
+    """Result row shown for a successfully parsed email"""
+    body = email_content.body_text or ""
+    return {
+        'filename': filename,
+        'subject': email_content.subject,
+        'sender': email_content.sender,
+        'recipient_count': len(email_content.recipients),
+        'date': email_content.sent_date.isoformat() if email_content.sent_date else None,
+        'body_preview': body[:200] + "..." if len(body) > 200 else body,
+        'categories': email_content.categories,
+        'entity_counts': {k: len(v) for k, v in email_content.extracted_entities.items()},
+        'correlation_score': email_content.correlation_score,
+        'status': 'success'
+    }
+
+def parse_one_email(parser, cache: ParseCache, key: str, uploaded_file) -> Dict[str, Any]:
+    """Parse a single uploaded .msg file (runs in a worker thread, so no st.* calls)"""
+    try:
+        # Uploads are already held in memory, so parse them in place rather than via a temp file
+        uploaded_file.seek(0)
+        email_content = parser.parse_msg_stream(uploaded_file, uploaded_file.name)
+        
+        if email_content:
+            cache.put(key, email_content)  # Failures are not cached
+            return email_result(uploaded_file.name, email_content)
+        
+        return {
+            'filename': uploaded_file.name,
+            'status': 'error',
+            'error': 'Failed to parse email file'
+        }
+        
+    except Exception as e:
+        return {
+            'filename': uploaded_file.name,
+            'status': 'error',
+            'error': str(e)
+        }
 
 def process_data_files(uploaded_files, template):
     """Process uploaded data files"""
     try:
-        mapper = ConfigurableDataIngestionMapper("config")
+        mapper = get_mapper("config")
     except Exception as e:
         st.error(f"❌ Failed to initialize data mapper: {e}")
         return
@@ -271,111 +490,191 @@ def process_data_files(uploaded_files, template):
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    results = []
-    
-    for i, uploaded_file in enumerate(uploaded_files):
-        status_text.text(f"Processing {uploaded_file.name} with {template}...")
-        progress_bar.progress((i + 1) / len(uploaded_files))
-        
-        try:
-            # Save uploaded file temporarily
-            suffix = Path(uploaded_file.name).suffix
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                tmp_file.write(uploaded_file.read())
-                tmp_file_path = tmp_file.name
-            
-            # Process the file (simplified for demo)
-            result = {
-                'filename': uploaded_file.name,
-                'template': template,
-                'status': 'processed',
-                'input_path': tmp_file_path,
-                'message': f'File processed with {template}'
-            }
-            
-            results.append(result)
-            
-            # Clean up temp file
-            os.unlink(tmp_file_path)
-            
-        except Exception as e:
-            results.append({
-                'filename': uploaded_file.name,
-                'template': template,
-                'status': 'error',
-                'error': str(e)
-            })
+    results = run_in_parallel(
+        uploaded_files,
+        lambda uploaded_file: process_one_data_file(uploaded_file, template),
+        progress_bar,
+        status_text
+    )
     
     # Store results in session state
-    st.session_state.data_results.extend(results)
+    add_to_history('data_results', results)
     
     progress_bar.progress(1.0)
     status_text.text("✅ Processing complete!")
     
     # Show immediate results
     st.success(f"🎉 Processed {len(uploaded_files)} data files!")
-    display_data_results(results)
-
-def display_email_results(results):
-    """Display email parsing results"""
-    for idx, result in enumerate(results):
-        with st.expander(f"📧 {result['filename']}", expanded=False):
-            if result['status'] == 'success':
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write("**Subject:**", result.get('subject', 'N/A'))
-                    st.write("**Sender:**", result.get('sender', 'N/A'))
-                    st.write("**Date:**", result.get('date', 'N/A'))
-                    st.write("**Categories:**", ', '.join(result.get('categories', [])))
-                
-                with col2:
-                    st.write("**Recipients:**", len(result.get('recipients', [])))
-                    st.write("**Correlation Score:**", f"{result.get('correlation_score', 0):.2f}")
-                    
-                    entities = result.get('entities', {})
-                    st.write("**Extracted Entities:**")
-                    for entity_type, entity_list in entities.items():
-                        if entity_list:
-                            st.write(f"  • {entity_type}: {len(entity_list)}")
-                
-                if result.get('body_preview'):
-                    st.write("**Body Preview:**")
-                    # Create unique key using index and filename hash
-                    unique_key = f"body_{idx}_{hash(result['filename']) % 10000}"
-                    st.text_area("", result['body_preview'], height=100, disabled=True, key=unique_key)
+    display_data_results(results, key="data_latest")
+
+def process_one_data_file(uploaded_file, template) -> Dict[str, Any]:
+    """Process a single uploaded data file (runs in a worker thread, so no st.* calls)"""
+    try:
+        # Save uploaded file temporarily
+        suffix = Path(uploaded_file.name).suffix
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+            shutil.copyfileobj(uploaded_file, tmp_file, length=1024 * 1024)
+            tmp_file_path = tmp_file.name
+        
+        # Process the file (simplified for demo)
+        result = {
+            'filename': uploaded_file.name,
+            'template': template,
+            'status': 'processed',
+            'input_path': tmp_file_path,
+            'message': f'File processed with {template}'
+        }
+        
+        # Clean up temp file
+        os.unlink(tmp_file_path)
+        return result
+        
+    except Exception as e:
+        return {
+            'filename': uploaded_file.name,
+            'template': template,
+            'status': 'error',
+            'error': str(e)
+        }
+
+def run_in_parallel(uploaded_files, process_file, progress_bar, status_text) -> List[Dict[str, Any]]:
+    """Run process_file over the uploads in a thread pool, keeping results in upload order"""
+    total = len(uploaded_files)
+    results = [None] * total
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(process_file, uploaded_file): i
+            for i, uploaded_file in enumerate(uploaded_files)
+        }
+        # Widgets are only updated from the script thread, and at most every
+        # PROGRESS_INTERVAL seconds since each update is a round-trip to the browser
+        last_update = 0.0
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            results[i] = future.result()
+            now = time.monotonic()
+            if total < 20 or now - last_update >= PROGRESS_INTERVAL or done == total:
+                status_text.text(f"Processed {uploaded_files[i].name} ({done}/{total})")
+                progress_bar.progress(done / total)
+                last_update = now
+    
+    return results
+
+@fragment
+def email_history_fragment(limit=None, key="email_history"):
+    """Email history pane; its widgets rerun only this fragment, not the whole script"""
+    display_email_results(load_history('email_results', limit), key=key)
+
+@fragment
+def data_history_fragment(limit=None, key="data_history"):
+    """Data history pane; its widgets rerun only this fragment, not the whole script"""
+    display_data_results(load_history('data_results', limit), key=key)
+
+def display_email_results(results, key="email"):
+    """Display email parsing results as a single table, with details for one selected row"""
+    if not results:
+        return
+    
+    rows = [
+        {
+            'filename': result['filename'],
+            'status': result['status'],
+            'subject': result.get('subject'),
+            'sender': result.get('sender'),
+            'date': result.get('date'),
+            'categories': ', '.join(result.get('categories', [])),
+            'recipients': result.get('recipient_count', 0),
+            'correlation_score': result.get('correlation_score'),
+            'body_preview': result.get('body_preview') or result.get('error'),
+        }
+        for result in results
+    ]
+    st.dataframe(
+        pd.DataFrame(rows),
+        column_config={
+            'body_preview': st.column_config.TextColumn("Body Preview / Error", width="large"),
+            'correlation_score': st.column_config.ProgressColumn(
+                "Correlation Score", min_value=0, max_value=1, format="%.2f"
+            ),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+    
+    # Full details only for the row the user asks about
+    idx = st.selectbox(
+        "🔎 Inspect result",
+        range(len(results)),
+        format_func=lambda i: f"📧 {results[i]['filename']}",
+        key=f"{key}_inspect",
+    )
+    result = results[idx]
+    
+    if result['status'] == 'success':
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Subject:**", result.get('subject', 'N/A'))
+            st.write("**Sender:**", result.get('sender', 'N/A'))
+            st.write("**Date:**", result.get('date', 'N/A'))
+            st.write("**Categories:**", ', '.join(result.get('categories', [])))
+        
+        with col2:
+            st.write("**Recipients:**", result.get('recipient_count', 0))
+            st.write("**Correlation Score:**", f"{result.get('correlation_score', 0):.2f}")
             
-            else:
-                st.error(f"❌ Error: {result.get('error', 'Unknown error')}")
-
-def display_data_results(results):
-    """Display data ingestion results"""
-    for idx, result in enumerate(results):
-        with st.expander(f"📊 {result['filename']}", expanded=False):
-            if result['status'] == 'processed':
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write("**Template:**", result.get('template', 'N/A'))
-                    st.write("**Status:**", result.get('status', 'N/A'))
-                
-                with col2:
-                    st.write("**Message:**", result.get('message', 'N/A'))
-                
-                st.success("✅ File processed successfully")
-            else:
-                st.error(f"❌ Error: {result.get('error', 'Unknown error')}")
+            entity_counts = result.get('entity_counts', {})
+            st.write("**Extracted Entities:**")
+            for entity_type, count in entity_counts.items():
+                if count:
+                    st.write(f"  • {entity_type}: {count}")
+        
+        if result.get('body_preview'):
+            st.write("**Body Preview:**")
+            st.text_area("", result['body_preview'], height=100, disabled=True,
+                         key=f"{key}_body_{result['_id']}")
+    
+    else:
+        st.error(f"❌ Error: {result.get('error', 'Unknown error')}")
+
+def display_data_results(results, key="data"):
+    """Display data ingestion results as a single table"""
+    if not results:
+        return
+    
+    rows = [
+        {
+            'filename': result['filename'],
+            'template': result.get('template', 'N/A'),
+            'status': result['status'],
+            'message': result.get('message') or f"❌ {result.get('error', 'Unknown error')}",
+        }
+        for result in results
+    ]
+    st.dataframe(
+        pd.DataFrame(rows),
+        column_config={'message': st.column_config.TextColumn("Message", width="large")},
+        hide_index=True,
+        use_container_width=True,
+    )
 
 def get_available_templates():
     """Get list of available templates"""
+    config_path = Path("config/templates_config.json")
     try:
-        config_path = Path("config/templates_config.json")
-        if config_path.exists():
-            with open(config_path) as f:
-                config = json.load(f)
-            return list(config.get("templates", {}).keys())
-        else:
-            return ["template_1", "template_2"]
+        mtime = config_path.stat().st_mtime
+    except OSError:
+        return ["template_1", "template_2"]
+    return load_templates(str(config_path), mtime)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_templates(config_path: str, mtime: float):
+    """Read template names from config (mtime is part of the cache key so edits invalidate it)"""
+    try:
+        with open(config_path, 'rb') as f:
+            config = json_loads(f.read())
+        return list(config.get("templates", {}).keys())
     except Exception:
         return ["template_1", "template_2"]
 
@@ -5,30 +5,143 @@ Provides a simple web interface for both email parsing and data ingestion functi
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
+import secrets
 import shutil
 import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-import uuid
+
+import aiofiles
 
 try:
     import uvicorn
-    from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+    from anyio import to_thread
+    from fastapi import BackgroundTasks, FastAPI, File, UploadFile, HTTPException, Form
+    from fastapi.concurrency import run_in_threadpool
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+    from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, ORJSONResponse
     from fastapi.staticfiles import StaticFiles
 except ImportError:
     print("Warning: FastAPI/uvicorn not installed. Install with: uv pip install 'email-parsing-mcp[network]'")
     raise
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import httptools
+except ImportError:
+    httptools = None
+
 from email_parser.mcp_server import EmailParserMCPServer
 from data_ingestion.mapper import ConfigurableDataIngestionMapper
 
 logger = logging.getLogger(__name__)
 
+_EMAIL_EXTS = ('.msg',)
+_DATA_EXTS = ('.xlsx', '.xls', '.csv')
+
+def run_event_loop(main) -> None:
+    """Run a coroutine to completion on uvloop when available, else the stock event loop"""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main)
+
+def _find_output_file(output_dirs: List[Path], file_id: str) -> Optional[Path]:
+    """Return the first processed file whose name contains file_id"""
+    for output_dir in output_dirs:
+        try:
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    if file_id in entry.name and entry.is_file():
+                        return Path(entry.path)
+        except FileNotFoundError:
+            continue
+    return None
+
+def _email_result(email_content, file_path: str) -> Dict[str, Any]:
+    """Compact per-email result rendered by the upload page"""
+    body = email_content.body_text or ""
+    return {
+        "file_path": file_path,
+        "subject": email_content.subject,
+        "sender": email_content.sender,
+        "recipients": email_content.recipients,
+        "date": email_content.sent_date,  # rendered as ISO 8601 by the response encoder
+        "body": body[:500] + ("..." if len(body) > 500 else ""),
+        "category": email_content.categories[0] if email_content.categories else "uncategorized",
+        "entities": email_content.extracted_entities
+    }
+
+def _cleanup_paths(paths: List[Path]):
+    """Delete temporary upload files, ignoring ones that are already gone"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove temporary file {path}: {e}")
+
+def _copy_in_kernel(src, dst) -> bool:
+    """Copy a disk-backed upload with copy_file_range(2); False if unsupported"""
+    if not hasattr(os, "copy_file_range") or not getattr(src, "_rolled", False):
+        return False
+    src.flush()
+    in_fd, out_fd = src.fileno(), dst.fileno()
+    offset = src.tell()
+    remaining = os.fstat(in_fd).st_size - offset
+    try:
+        while remaining > 0:
+            copied = os.copy_file_range(in_fd, out_fd, remaining, offset)
+            if copied == 0:
+                break
+            offset += copied
+            remaining -= copied
+    except OSError:
+        if offset != src.tell():
+            raise
+        return False
+    src.seek(offset)
+    return True
+
+def _spool_to_disk(src, dst_path: str):
+    """Copy an uploaded file object to disk (blocking; run in an executor)"""
+    with open(dst_path, "wb") as buffer:
+        if not _copy_in_kernel(src, buffer):
+            shutil.copyfileobj(src, buffer, length=1 << 20)
+
+async def _save_upload(file: UploadFile, dst_path: Path):
+    """Write an upload to dst_path without blocking the event loop"""
+    if hasattr(os, "copy_file_range") and getattr(file.file, "_rolled", False):
+        # Already on disk: a single in-kernel copy on a worker thread
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _spool_to_disk, file.file, str(dst_path))
+        return
+    async with aiofiles.open(dst_path, "wb") as out:
+        while chunk := await file.read(1 << 20):
+            await out.write(chunk)
+
+class _VersionedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache content-versioned (?v=) assets for a year"""
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if b"v=" in scope.get("query_string", b""):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 class WebUIServer:
     """Web UI server combining email parsing and data ingestion"""
     
@@ -38,15 +151,41 @@ class WebUIServer:
         self.app = FastAPI(
             title="Email Parser & Data Ingestion Web UI",
             description="Web interface for email parsing and data ingestion",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse if orjson is not None else JSONResponse
         )
         
         # Initialize MCP server for email parsing
         self.mcp_server = EmailParserMCPServer()
         
-        # Create temp directory for uploads
-        self.temp_dir = Path(tempfile.gettempdir()) / "email_parser_ui"
-        self.temp_dir.mkdir(exist_ok=True)
+        # Bound how many uploaded files are parsed/processed at once
+        self._upload_sem = asyncio.Semaphore(int(os.getenv("UPLOAD_CONCURRENCY", "16")))
+        
+        # Output directory per template, created once up front. These are the only
+        # templates uploads accept and the only directories downloads search.
+        self._output_dirs: Dict[str, Path] = {
+            template: Path("output") / template for template in ("template_1", "template_2")
+        }
+        for output_dir in self._output_dirs.values():
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # file_id -> processed output file, filled as downloads are resolved
+        self._output_index: Dict[str, Path] = {}
+        
+        # Data ingestion mapper, built on first use
+        self._mapper: Optional[ConfigurableDataIngestionMapper] = None
+        
+        # Private (0700) temp directory for uploads and generated assets, removed on shutdown
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="email_parser_ui_"))
+        
+        # The page is static: write it once and let Starlette serve it from disk
+        self.static_dir = self.temp_dir / "static"
+        self.static_dir.mkdir()
+        self.index_path = self.static_dir / "index.html"
+        self._write_static_assets()
+        
+        # (mtime, template names) of the last templates_config.json read
+        self._templates_cache: Optional[tuple[float, List[str]]] = None
         
         # Setup CORS
         self.app.add_middleware(
@@ -58,6 +197,7 @@ class WebUIServer:
         )
         
         self._setup_routes()
+        self.app.mount("/static", _VersionedStaticFiles(directory=str(self.static_dir)), name="static")
     
     def _setup_routes(self):
         """Setup all routes for the web UI"""
@@ -65,7 +205,7 @@ class WebUIServer:
         @self.app.get("/", response_class=HTMLResponse)
         async def home():
             """Serve the main UI page"""
-            return self._get_html_template()
+            return FileResponse(self.index_path, media_type="text/html")
         
         @self.app.get("/health")
         async def health_check():
@@ -73,34 +213,53 @@ class WebUIServer:
         
         # Email parsing endpoints
         @self.app.post("/api/email/upload")
-        async def upload_email_files(files: List[UploadFile] = File(...)):
+        async def upload_email_files(background_tasks: BackgroundTasks,
+                                     files: List[UploadFile] = File(...)):
             """Upload and parse email files"""
+            temp_paths = []
             try:
-                results = []
+                saved = []
+                tasks = []
                 for file in files:
-                    if not file.filename.endswith('.msg'):
+                    if not file.filename.lower().endswith(_EMAIL_EXTS):
+                        continue
+                    
+                    file_id = secrets.token_hex(8)
+                    
+                    # Uploads under the spool threshold are still in memory; parse them directly
+                    if not getattr(file.file, "_rolled", True):
+                        data = await file.read()
+                        saved.append((file_id, None, file.filename))
+                        tasks.append(self._limited(self._parse_email_bytes(data, file.filename)))
                         continue
                     
                     # Save uploaded file
-                    file_id = str(uuid.uuid4())
                     file_path = self.temp_dir / f"{file_id}_{file.filename}"
                     
-                    with open(file_path, "wb") as buffer:
-                        shutil.copyfileobj(file.file, buffer)
+                    temp_paths.append(file_path)
+                    await _save_upload(file, file_path)
                     
-                    # Parse the email
-                    result = await self._parse_email_file(str(file_path))
-                    result["original_filename"] = file.filename
+                    saved.append((file_id, file_path, file.filename))
+                    tasks.append(self._limited(self._parse_email_file(file_path)))
+                
+                # Parse all emails concurrently
+                parsed = await asyncio.gather(*tasks, return_exceptions=True)
+                
+                results = []
+                for (file_id, file_path, filename), result in zip(saved, parsed):
+                    if isinstance(result, Exception):
+                        result = {"error": str(result), "file_path": str(file_path or filename)}
+                    result["original_filename"] = filename
                     result["file_id"] = file_id
                     results.append(result)
-                    
-                    # Clean up uploaded file
-                    os.unlink(file_path)
                 
+                # Remove uploaded files after the response has been sent
+                background_tasks.add_task(_cleanup_paths, temp_paths)
                 return {"results": results, "total_files": len(results)}
                 
             except Exception as e:
                 logger.error(f"Error uploading email files: {e}")
+                _cleanup_paths(temp_paths)
                 raise HTTPException(status_code=500, detail=str(e))
         
         # Data ingestion endpoints
@@ -110,23 +269,37 @@ class WebUIServer:
             template: str = Form(...)
         ):
             """Upload and process data files with template"""
+            # Only the fixed output templates are valid; never build paths from request data
+            if template not in self._output_dirs:
+                raise HTTPException(status_code=400, detail=f"Unknown template: {template}")
+            
             try:
-                results = []
+                saved = []
                 
                 for file in files:
-                    if not any(file.filename.endswith(ext) for ext in ['.xlsx', '.xls', '.csv']):
+                    if not file.filename.lower().endswith(_DATA_EXTS):
                         continue
                     
                     # Save uploaded file
-                    file_id = str(uuid.uuid4())
+                    file_id = secrets.token_hex(8)
                     input_path = self.temp_dir / f"{file_id}_{file.filename}"
                     
-                    with open(input_path, "wb") as buffer:
-                        shutil.copyfileobj(file.file, buffer)
+                    await _save_upload(file, input_path)
                     
-                    # Process the file
-                    result = await self._process_data_file(str(input_path), template)
-                    result["original_filename"] = file.filename
+                    saved.append((file_id, input_path, file.filename))
+                
+                # Process all files concurrently
+                processed = await asyncio.gather(
+                    *[self._limited(self._process_data_file(input_path, template))
+                      for _, input_path, _ in saved],
+                    return_exceptions=True
+                )
+                
+                results = []
+                for (file_id, input_path, filename), result in zip(saved, processed):
+                    if isinstance(result, Exception):
+                        result = {"error": str(result), "file_path": str(input_path)}
+                    result["original_filename"] = filename
                     result["file_id"] = file_id
                     results.append(result)
                 
@@ -141,13 +314,19 @@ class WebUIServer:
             """Get list of available data templates"""
             try:
                 config_path = Path("config/templates_config.json")
-                if not config_path.exists():
+                try:
+                    mtime = config_path.stat().st_mtime
+                except FileNotFoundError:
                     return {"templates": ["template_1", "template_2"]}
                 
+                if self._templates_cache and self._templates_cache[0] == mtime:
+                    return {"templates": self._templates_cache[1]}
+                
                 with open(config_path) as f:
                     config = json.load(f)
                 
                 templates = list(config.get("templates", {}).keys())
+                self._templates_cache = (mtime, templates)
                 return {"templates": templates}
                 
             except Exception as e:
@@ -158,73 +337,83 @@ class WebUIServer:
         async def download_processed_file(file_id: str):
             """Download a processed data file"""
             try:
-                # Look for the processed file in output directories
-                output_dirs = ["output/template_1", "output/template_2"]
+                file_path = self._output_index.get(file_id)
+                if file_path is None or not file_path.is_file():
+                    # Look for the processed file in output directories
+                    output_dirs = list(self._output_dirs.values())
+                    loop = asyncio.get_running_loop()
+                    file_path = await loop.run_in_executor(None, _find_output_file, output_dirs, file_id)
+                    if file_path is None:
+                        raise HTTPException(status_code=404, detail="File not found")
+                    self._output_index[file_id] = file_path
                 
-                for output_dir in output_dirs:
-                    output_path = Path(output_dir)
-                    if output_path.exists():
-                        for file_path in output_path.glob(f"*{file_id}*"):
-                            if file_path.is_file():
-                                return FileResponse(
-                                    path=str(file_path),
-                                    filename=file_path.name,
-                                    media_type='application/octet-stream'
-                                )
-                
-                raise HTTPException(status_code=404, detail="File not found")
+                return FileResponse(
+                    path=str(file_path),
+                    filename=file_path.name,
+                    media_type='application/octet-stream'
+                )
                 
+            except HTTPException:
+                raise
             except Exception as e:
                 logger.error(f"Error downloading file: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
     
-    async def _parse_email_file(self, file_path: str) -> Dict[str, Any]:
-        """Parse a single email file using MCP server"""
+    async def _limited(self, coro):
+        """Await coro while holding an upload concurrency slot"""
+        async with self._upload_sem:
+            return await coro
+    
+    async def _parse_email_file(self, file_path: Path) -> Dict[str, Any]:
+        """Parse a single email file with the MCP server's parser"""
         try:
-            # Call the MCP tool directly
-            result = await self.mcp_server.mcp._call_tool("parse_email_file", {"file_path": file_path})
-            return result
+            # Parsing is CPU-bound; keep it off the event loop
+            email_content = await run_in_threadpool(self.mcp_server.parser.parse_msg_file, file_path)
+            if email_content:
+                return _email_result(email_content, str(file_path))
+            else:
+                return {"error": "Failed to parse email file", "file_path": str(file_path)}
             
         except Exception as e:
             logger.error(f"Error parsing email file {file_path}: {e}")
-            # Fallback to direct parser if MCP fails
-            try:
-                parser = self.mcp_server.parser
-                email_content = parser.parse_msg_file(Path(file_path))
-                if email_content:
-                    return {
-                        "file_path": file_path,
-                        "subject": email_content.subject,
-                        "sender": email_content.sender,
-                        "recipients": email_content.recipients,
-                        "date": email_content.sent_date.isoformat() if email_content.sent_date else None,
-                        "body": email_content.body_text[:500] + "..." if len(email_content.body_text or "") > 500 else email_content.body_text,
-                        "category": email_content.categories[0] if email_content.categories else "uncategorized",
-                        "entities": email_content.extracted_entities
-                    }
-                else:
-                    return {"error": "Failed to parse email file", "file_path": file_path}
-            except Exception as fallback_error:
-                logger.error(f"Fallback parsing also failed: {fallback_error}")
-                return {"error": str(e), "file_path": file_path}
+            return {"error": str(e), "file_path": str(file_path)}
+    
+    async def _parse_email_bytes(self, data: bytes, filename: str) -> Dict[str, Any]:
+        """Parse an in-memory email upload without writing it to disk"""
+        try:
+            # Parsing is CPU-bound; keep it off the event loop
+            email_content = await run_in_threadpool(self.mcp_server.parser.parse_msg_stream, data, filename)
+            if email_content is None:
+                return {"error": "Failed to parse email file", "file_path": filename}
+            return _email_result(email_content, filename)
+            
+        except Exception as e:
+            logger.error(f"Error parsing email upload {filename}: {e}")
+            return {"error": str(e), "file_path": filename}
     
-    async def _process_data_file(self, file_path: str, template: str) -> Dict[str, Any]:
+    @property
+    def mapper(self) -> ConfigurableDataIngestionMapper:
+        """Data ingestion mapper, loaded from config on first access"""
+        if self._mapper is None:
+            self._mapper = ConfigurableDataIngestionMapper("config")
+        return self._mapper
+    
+    async def _process_data_file(self, file_path: Path, template: str) -> Dict[str, Any]:
         """Process a data file with specified template"""
         try:
-            # Initialize the data ingestion mapper
-            mapper = ConfigurableDataIngestionMapper("config")
+            # Reuse the shared data ingestion mapper
+            mapper = self.mapper
             
             # Process the single file
-            output_dir = f"output/{template}"
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            output_dir = self._output_dirs[template]
             
             # This is simplified - in a real implementation you'd call the mapper
             # For now, we'll return a success message
             result = {
                 "status": "processed",
                 "template": template,
-                "input_file": file_path,
-                "output_dir": output_dir,
+                "input_file": str(file_path),
+                "output_dir": str(output_dir),
                 "message": f"File processed with {template}"
             }
             
@@ -232,248 +421,31 @@ class WebUIServer:
             
         except Exception as e:
             logger.error(f"Error processing data file {file_path}: {e}")
-            return {"error": str(e), "file_path": file_path}
+            return {"error": str(e), "file_path": str(file_path)}
+    
+    def _write_static_assets(self):
+        """Write the stylesheet, script and page into the static directory"""
+        urls = {}
+        for name, content in (("app.css", self._get_css()), ("app.js", self._get_js())):
+            data = content.encode("utf-8")
+            (self.static_dir / name).write_bytes(data)
+            # Content hash in the URL lets browsers cache the asset indefinitely
+            urls[name] = f"/static/{name}?v={hashlib.blake2b(data, digest_size=8).hexdigest()}"
+        
+        html = self._get_html_template(urls["app.css"], urls["app.js"])
+        self.index_path.write_text(html, encoding="utf-8")
     
-    def _get_html_template(self) -> str:
+    def _get_html_template(self, css_url: str, js_url: str) -> str:
         """Return the HTML template for the web UI"""
-        return '''
+        return f'''
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Email Parser & Data Ingestion</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        
-        .header {
-            background: linear-gradient(135deg, #2c3e50, #3498db);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }
-        
-        .header h1 {
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }
-        
-        .header p {
-            font-size: 1.1em;
-            opacity: 0.9;
-        }
-        
-        .main-content {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 0;
-        }
-        
-        .section {
-            padding: 40px;
-            min-height: 500px;
-        }
-        
-        .section:first-child {
-            border-right: 1px solid #eee;
-        }
-        
-        .section h2 {
-            color: #2c3e50;
-            margin-bottom: 20px;
-            font-size: 1.8em;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        
-        .upload-area {
-            border: 3px dashed #ddd;
-            border-radius: 10px;
-            padding: 40px 20px;
-            text-align: center;
-            margin: 20px 0;
-            transition: all 0.3s ease;
-            cursor: pointer;
-        }
-        
-        .upload-area:hover {
-            border-color: #3498db;
-            background: #f8f9fa;
-        }
-        
-        .upload-area.dragover {
-            border-color: #2ecc71;
-            background: #d5f4e6;
-        }
-        
-        .upload-icon {
-            font-size: 3em;
-            color: #bdc3c7;
-            margin-bottom: 15px;
-        }
-        
-        .upload-text {
-            color: #7f8c8d;
-            font-size: 1.1em;
-        }
-        
-        .file-input {
-            display: none;
-        }
-        
-        .template-select {
-            margin: 20px 0;
-        }
-        
-        .template-select select {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            font-size: 1em;
-            background: white;
-        }
-        
-        .process-btn {
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-            border: none;
-            padding: 15px 30px;
-            border-radius: 8px;
-            font-size: 1.1em;
-            cursor: pointer;
-            width: 100%;
-            margin-top: 20px;
-            transition: all 0.3s ease;
-        }
-        
-        .process-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(52, 152, 219, 0.4);
-        }
-        
-        .process-btn:disabled {
-            background: #bdc3c7;
-            cursor: not-allowed;
-            transform: none;
-            box-shadow: none;
-        }
-        
-        .results {
-            margin-top: 30px;
-            max-height: 400px;
-            overflow-y: auto;
-        }
-        
-        .result-item {
-            background: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 8px;
-            padding: 15px;
-            margin-bottom: 10px;
-        }
-        
-        .result-success {
-            border-left: 4px solid #28a745;
-        }
-        
-        .result-error {
-            border-left: 4px solid #dc3545;
-        }
-        
-        .result-filename {
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 5px;
-        }
-        
-        .result-details {
-            font-size: 0.9em;
-            color: #6c757d;
-        }
-        
-        .loading {
-            display: none;
-            text-align: center;
-            padding: 20px;
-        }
-        
-        .loading.show {
-            display: block;
-        }
-        
-        .spinner {
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #3498db;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 15px;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .file-list {
-            margin-top: 15px;
-        }
-        
-        .file-item {
-            background: #e3f2fd;
-            padding: 8px 12px;
-            border-radius: 5px;
-            margin-bottom: 5px;
-            font-size: 0.9em;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .remove-file {
-            background: #ff6b6b;
-            color: white;
-            border: none;
-            border-radius: 3px;
-            padding: 2px 6px;
-            font-size: 0.8em;
-            cursor: pointer;
-        }
-        
-        @media (max-width: 768px) {
-            .main-content {
-                grid-template-columns: 1fr;
-            }
-            
-            .section:first-child {
-                border-right: none;
-                border-bottom: 1px solid #eee;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{css_url}">
+    <script src="{js_url}" defer></script>
 </head>
 <body>
     <div class="container">
@@ -553,233 +525,482 @@ class WebUIServer:
         </div>
     </div>
 
-    <script>
-        // Email Parser functionality
-        let emailFiles = [];
-        let dataFiles = [];
-        
-        // Load available templates
-        fetch('/api/data/templates')
-            .then(response => response.json())
-            .then(data => {
-                const select = document.getElementById('templateSelect');
-                select.innerHTML = '<option value="">Select Template...</option>';
-                data.templates.forEach(template => {
-                    select.innerHTML += `<option value="${template}">${template}</option>`;
-                });
-            });
-        
-        // Email upload handling
-        setupFileUpload(
-            'emailUploadArea', 
-            'emailFileInput', 
-            'emailFileList', 
-            'processEmailBtn',
-            emailFiles,
-            '.msg'
-        );
-        
-        // Data upload handling  
-        setupFileUpload(
-            'dataUploadArea', 
-            'dataFileInput', 
-            'dataFileList', 
-            'processDataBtn',
-            dataFiles,
-            '.xlsx,.xls,.csv'
-        );
-        
-        // Process email files
-        document.getElementById('processEmailBtn').addEventListener('click', async () => {
-            const formData = new FormData();
-            emailFiles.forEach(file => formData.append('files', file));
-            
-            showLoading('emailLoading', true);
-            
-            try {
-                const response = await fetch('/api/email/upload', {
-                    method: 'POST',
-                    body: formData
-                });
-                
-                const result = await response.json();
-                displayResults('emailResults', result.results, 'email');
-            } catch (error) {
-                displayError('emailResults', error.message);
-            } finally {
-                showLoading('emailLoading', false);
-            }
+</body>
+</html>
+        '''
+    
+    def _get_css(self) -> str:
+        """Return the stylesheet for the web UI"""
+        return '''
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+    padding: 20px;
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 15px;
+    box-shadow: 0 20px 40px rgba(0,0,0,0.1);
+    overflow: hidden;
+}
+
+.header {
+    background: linear-gradient(135deg, #2c3e50, #3498db);
+    color: white;
+    padding: 30px;
+    text-align: center;
+}
+
+.header h1 {
+    font-size: 2.5em;
+    margin-bottom: 10px;
+}
+
+.header p {
+    font-size: 1.1em;
+    opacity: 0.9;
+}
+
+.main-content {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 0;
+}
+
+.section {
+    padding: 40px;
+    min-height: 500px;
+}
+
+.section:first-child {
+    border-right: 1px solid #eee;
+}
+
+.section h2 {
+    color: #2c3e50;
+    margin-bottom: 20px;
+    font-size: 1.8em;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+}
+
+.upload-area {
+    border: 3px dashed #ddd;
+    border-radius: 10px;
+    padding: 40px 20px;
+    text-align: center;
+    margin: 20px 0;
+    transition: all 0.3s ease;
+    cursor: pointer;
+}
+
+.upload-area:hover {
+    border-color: #3498db;
+    background: #f8f9fa;
+}
+
+.upload-area.dragover {
+    border-color: #2ecc71;
+    background: #d5f4e6;
+}
+
+.upload-icon {
+    font-size: 3em;
+    color: #bdc3c7;
+    margin-bottom: 15px;
+}
+
+.upload-text {
+    color: #7f8c8d;
+    font-size: 1.1em;
+}
+
+.file-input {
+    display: none;
+}
+
+.template-select {
+    margin: 20px 0;
+}
+
+.template-select select {
+    width: 100%;
+    padding: 12px;
+    border: 2px solid #ddd;
+    border-radius: 8px;
+    font-size: 1em;
+    background: white;
+}
+
+.process-btn {
+    background: linear-gradient(135deg, #3498db, #2980b9);
+    color: white;
+    border: none;
+    padding: 15px 30px;
+    border-radius: 8px;
+    font-size: 1.1em;
+    cursor: pointer;
+    width: 100%;
+    margin-top: 20px;
+    transition: all 0.3s ease;
+}
+
+.process-btn:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 5px 15px rgba(52, 152, 219, 0.4);
+}
+
+.process-btn:disabled {
+    background: #bdc3c7;
+    cursor: not-allowed;
+    transform: none;
+    box-shadow: none;
+}
+
+.results {
+    margin-top: 30px;
+    max-height: 400px;
+    overflow-y: auto;
+}
+
+.result-item {
+    background: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-radius: 8px;
+    padding: 15px;
+    margin-bottom: 10px;
+}
+
+.result-success {
+    border-left: 4px solid #28a745;
+}
+
+.result-error {
+    border-left: 4px solid #dc3545;
+}
+
+.result-filename {
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 5px;
+}
+
+.result-details {
+    font-size: 0.9em;
+    color: #6c757d;
+}
+
+.loading {
+    display: none;
+    text-align: center;
+    padding: 20px;
+}
+
+.loading.show {
+    display: block;
+}
+
+.spinner {
+    border: 4px solid #f3f3f3;
+    border-top: 4px solid #3498db;
+    border-radius: 50%;
+    width: 40px;
+    height: 40px;
+    animation: spin 1s linear infinite;
+    margin: 0 auto 15px;
+}
+
+@keyframes spin {
+    0% { transform: rotate(0deg); }
+    100% { transform: rotate(360deg); }
+}
+
+.file-list {
+    margin-top: 15px;
+}
+
+.file-item {
+    background: #e3f2fd;
+    padding: 8px 12px;
+    border-radius: 5px;
+    margin-bottom: 5px;
+    font-size: 0.9em;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.remove-file {
+    background: #ff6b6b;
+    color: white;
+    border: none;
+    border-radius: 3px;
+    padding: 2px 6px;
+    font-size: 0.8em;
+    cursor: pointer;
+}
+
+@media (max-width: 768px) {
+    .main-content {
+        grid-template-columns: 1fr;
+    }
+
+    .section:first-child {
+        border-right: none;
+        border-bottom: 1px solid #eee;
+    }
+}
+        '''
+    
+    def _get_js(self) -> str:
+        """Return the client-side script for the web UI"""
+        return '''
+// Email Parser functionality
+let emailFiles = [];
+let dataFiles = [];
+
+// Load available templates
+fetch('/api/data/templates')
+    .then(response => response.json())
+    .then(data => {
+        const select = document.getElementById('templateSelect');
+        select.innerHTML = '<option value="">Select Template...</option>';
+        data.templates.forEach(template => {
+            select.innerHTML += `<option value="${template}">${template}</option>`;
         });
-        
-        // Process data files
-        document.getElementById('processDataBtn').addEventListener('click', async () => {
-            const template = document.getElementById('templateSelect').value;
-            if (!template) {
-                alert('Please select a template first');
-                return;
-            }
-            
-            const formData = new FormData();
-            dataFiles.forEach(file => formData.append('files', file));
-            formData.append('template', template);
-            
-            showLoading('dataLoading', true);
-            
-            try {
-                const response = await fetch('/api/data/upload', {
-                    method: 'POST',
-                    body: formData
-                });
-                
-                const result = await response.json();
-                displayResults('dataResults', result.results, 'data');
-            } catch (error) {
-                displayError('dataResults', error.message);
-            } finally {
-                showLoading('dataLoading', false);
-            }
+    });
+
+// Email upload handling
+setupFileUpload(
+    'emailUploadArea', 
+    'emailFileInput', 
+    'emailFileList', 
+    'processEmailBtn',
+    emailFiles,
+    '.msg'
+);
+
+// Data upload handling  
+setupFileUpload(
+    'dataUploadArea', 
+    'dataFileInput', 
+    'dataFileList', 
+    'processDataBtn',
+    dataFiles,
+    '.xlsx,.xls,.csv'
+);
+
+// Process email files
+document.getElementById('processEmailBtn').addEventListener('click', async () => {
+    const formData = new FormData();
+    emailFiles.forEach(file => formData.append('files', file));
+
+    showLoading('emailLoading', true);
+
+    try {
+        const response = await fetch('/api/email/upload', {
+            method: 'POST',
+            body: formData
         });
-        
-        function setupFileUpload(uploadAreaId, fileInputId, fileListId, btnId, filesArray, accept) {
-            const uploadArea = document.getElementById(uploadAreaId);
-            const fileInput = document.getElementById(fileInputId);
-            const fileList = document.getElementById(fileListId);
-            const processBtn = document.getElementById(btnId);
-            
-            uploadArea.addEventListener('click', () => fileInput.click());
-            
-            uploadArea.addEventListener('dragover', (e) => {
-                e.preventDefault();
-                uploadArea.classList.add('dragover');
-            });
-            
-            uploadArea.addEventListener('dragleave', () => {
-                uploadArea.classList.remove('dragover');
-            });
-            
-            uploadArea.addEventListener('drop', (e) => {
-                e.preventDefault();
-                uploadArea.classList.remove('dragover');
-                handleFiles(e.dataTransfer.files, filesArray, fileList, processBtn, accept);
-            });
-            
-            fileInput.addEventListener('change', (e) => {
-                handleFiles(e.target.files, filesArray, fileList, processBtn, accept);
-            });
-        }
-        
-        function handleFiles(files, filesArray, fileListElement, processBtn, accept) {
-            const acceptedExts = accept.split(',').map(ext => ext.trim());
-            
-            Array.from(files).forEach(file => {
-                const isAccepted = acceptedExts.some(ext => 
-                    file.name.toLowerCase().endsWith(ext.replace('.', ''))
-                );
-                
-                if (isAccepted && !filesArray.find(f => f.name === file.name)) {
-                    filesArray.push(file);
-                }
-            });
-            
-            updateFileList(filesArray, fileListElement);
-            processBtn.disabled = filesArray.length === 0;
-        }
-        
-        function updateFileList(filesArray, fileListElement) {
-            fileListElement.innerHTML = filesArray.map((file, index) => `
-                <div class="file-item">
-                    <span>${file.name}</span>
-                    <button class="remove-file" onclick="removeFile(${index}, '${fileListElement.id}')">×</button>
-                </div>
-            `).join('');
-        }
-        
-        function removeFile(index, listId) {
-            const filesArray = listId.includes('email') ? emailFiles : dataFiles;
-            const processBtn = listId.includes('email') ? 
-                document.getElementById('processEmailBtn') : 
-                document.getElementById('processDataBtn');
-            const fileListElement = document.getElementById(listId);
-            
-            filesArray.splice(index, 1);
-            updateFileList(filesArray, fileListElement);
-            processBtn.disabled = filesArray.length === 0;
+
+        const result = await response.json();
+        displayResults('emailResults', result.results, 'email');
+    } catch (error) {
+        displayError('emailResults', error.message);
+    } finally {
+        showLoading('emailLoading', false);
+    }
+});
+
+// Process data files
+document.getElementById('processDataBtn').addEventListener('click', async () => {
+    const template = document.getElementById('templateSelect').value;
+    if (!template) {
+        alert('Please select a template first');
+        return;
+    }
+
+    const formData = new FormData();
+    dataFiles.forEach(file => formData.append('files', file));
+    formData.append('template', template);
+
+    showLoading('dataLoading', true);
+
+    try {
+        const response = await fetch('/api/data/upload', {
+            method: 'POST',
+            body: formData
+        });
+
+        const result = await response.json();
+        displayResults('dataResults', result.results, 'data');
+    } catch (error) {
+        displayError('dataResults', error.message);
+    } finally {
+        showLoading('dataLoading', false);
+    }
+});
+
+function setupFileUpload(uploadAreaId, fileInputId, fileListId, btnId, filesArray, accept) {
+    const uploadArea = document.getElementById(uploadAreaId);
+    const fileInput = document.getElementById(fileInputId);
+    const fileList = document.getElementById(fileListId);
+    const processBtn = document.getElementById(btnId);
+
+    uploadArea.addEventListener('click', () => fileInput.click());
+
+    uploadArea.addEventListener('dragover', (e) => {
+        e.preventDefault();
+        uploadArea.classList.add('dragover');
+    });
+
+    uploadArea.addEventListener('dragleave', () => {
+        uploadArea.classList.remove('dragover');
+    });
+
+    uploadArea.addEventListener('drop', (e) => {
+        e.preventDefault();
+        uploadArea.classList.remove('dragover');
+        handleFiles(e.dataTransfer.files, filesArray, fileList, processBtn, accept);
+    });
+
+    fileInput.addEventListener('change', (e) => {
+        handleFiles(e.target.files, filesArray, fileList, processBtn, accept);
+    });
+}
+
+function handleFiles(files, filesArray, fileListElement, processBtn, accept) {
+    const acceptedExts = accept.split(',').map(ext => ext.trim());
+
+    Array.from(files).forEach(file => {
+        const isAccepted = acceptedExts.some(ext => 
+            file.name.toLowerCase().endsWith(ext.replace('.', ''))
+        );
+
+        if (isAccepted && !filesArray.find(f => f.name === file.name)) {
+            filesArray.push(file);
         }
-        
-        function showLoading(loadingId, show) {
-            const loading = document.getElementById(loadingId);
-            if (show) {
-                loading.classList.add('show');
+    });
+
+    updateFileList(filesArray, fileListElement);
+    processBtn.disabled = filesArray.length === 0;
+}
+
+function updateFileList(filesArray, fileListElement) {
+    fileListElement.innerHTML = filesArray.map((file, index) => `
+        <div class="file-item">
+            <span>${file.name}</span>
+            <button class="remove-file" onclick="removeFile(${index}, '${fileListElement.id}')">×</button>
+        </div>
+    `).join('');
+}
+
+function removeFile(index, listId) {
+    const filesArray = listId.includes('email') ? emailFiles : dataFiles;
+    const processBtn = listId.includes('email') ? 
+        document.getElementById('processEmailBtn') : 
+        document.getElementById('processDataBtn');
+    const fileListElement = document.getElementById(listId);
+
+    filesArray.splice(index, 1);
+    updateFileList(filesArray, fileListElement);
+    processBtn.disabled = filesArray.length === 0;
+}
+
+function showLoading(loadingId, show) {
+    const loading = document.getElementById(loadingId);
+    if (show) {
+        loading.classList.add('show');
+    } else {
+        loading.classList.remove('show');
+    }
+}
+
+function displayResults(resultsId, results, type) {
+    const resultsElement = document.getElementById(resultsId);
+
+    resultsElement.innerHTML = results.map(result => {
+        const isError = result.error;
+        const className = isError ? 'result-error' : 'result-success';
+
+        let content = `
+            <div class="result-item ${className}">
+                <div class="result-filename">${result.original_filename || 'Unknown file'}</div>
+        `;
+
+        if (isError) {
+            content += `<div class="result-details">Error: ${result.error}</div>`;
+        } else {
+            if (type === 'email') {
+                content += `
+                    <div class="result-details">
+                        <strong>Subject:</strong> ${result.subject || 'N/A'}<br>
+                        <strong>From:</strong> ${result.sender || 'N/A'}<br>
+                        <strong>Category:</strong> ${result.category || 'N/A'}
+                    </div>
+                `;
             } else {
-                loading.classList.remove('show');
-            }
-        }
-        
-        function displayResults(resultsId, results, type) {
-            const resultsElement = document.getElementById(resultsId);
-            
-            resultsElement.innerHTML = results.map(result => {
-                const isError = result.error;
-                const className = isError ? 'result-error' : 'result-success';
-                
-                let content = `
-                    <div class="result-item ${className}">
-                        <div class="result-filename">${result.original_filename || 'Unknown file'}</div>
+                content += `
+                    <div class="result-details">
+                        <strong>Status:</strong> ${result.status || 'Processed'}<br>
+                        <strong>Template:</strong> ${result.template || 'N/A'}
+                    </div>
                 `;
-                
-                if (isError) {
-                    content += `<div class="result-details">Error: ${result.error}</div>`;
-                } else {
-                    if (type === 'email') {
-                        content += `
-                            <div class="result-details">
-                                <strong>Subject:</strong> ${result.subject || 'N/A'}<br>
-                                <strong>From:</strong> ${result.sender || 'N/A'}<br>
-                                <strong>Category:</strong> ${result.category || 'N/A'}
-                            </div>
-                        `;
-                    } else {
-                        content += `
-                            <div class="result-details">
-                                <strong>Status:</strong> ${result.status || 'Processed'}<br>
-                                <strong>Template:</strong> ${result.template || 'N/A'}
-                            </div>
-                        `;
-                    }
-                }
-                
-                content += '</div>';
-                return content;
-            }).join('');
-        }
-        
-        function displayError(resultsId, error) {
-            const resultsElement = document.getElementById(resultsId);
-            resultsElement.innerHTML = `
-                <div class="result-item result-error">
-                    <div class="result-filename">Processing Error</div>
-                    <div class="result-details">${error}</div>
-                </div>
-            `;
+            }
         }
-    </script>
-</body>
-</html>
+
+        content += '</div>';
+        return content;
+    }).join('');
+}
+
+function displayError(resultsId, error) {
+    const resultsElement = document.getElementById(resultsId);
+    resultsElement.innerHTML = `
+        <div class="result-item result-error">
+            <div class="result-filename">Processing Error</div>
+            <div class="result-details">${error}</div>
+        </div>
+    `;
+}
         '''
     
     async def run(self):
         """Start the web UI server"""
-        logger.info(f"Starting Web UI server on {self.host}:{self.port}")
+        loop_name = type(asyncio.get_running_loop()).__module__.split(".")[0]
+        logger.info(f"Starting Web UI server on {self.host}:{self.port} ({loop_name} event loop)")
+        
+        # Parsing and UploadFile reads run on anyio's worker threads (default 40)
+        limiter = to_thread.current_default_thread_limiter()
+        limiter.total_tokens = int(os.getenv("WEB_UI_THREADPOOL_SIZE", "200"))
+        logger.info(f"Worker thread limit: {limiter.total_tokens}")
         logger.info(f"Open your browser to: http://{self.host}:{self.port}")
         
         config = uvicorn.Config(
             app=self.app,
             host=self.host,
             port=self.port,
+            http="httptools" if httptools is not None else "auto",
             log_level="info"
         )
+        config.load()
+        logger.info(f"HTTP protocol: {config.http_protocol_class.__name__}")
         server = uvicorn.Server(config)
-        await server.serve()
+        try:
+            await server.serve()
+        finally:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
 
 async def start_web_ui(host: str = "localhost", port: int = 8080):
     """Start the web UI server"""
@@ -795,4 +1016,4 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    asyncio.run(start_web_ui(args.host, args.port))
\ No newline at end of file
+    run_event_loop(start_web_ui(args.host, args.port))
\ No newline at end of file
@@ -5,16 +5,17 @@ Starts the web interface for email parsing and data ingestion
 """
 
 import sys
-import asyncio
 from pathlib import Path
 
 # Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+src_path = str(Path(__file__).parent / "src")
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 def main():
     """Launch the FastAPI Web UI"""
     try:
-        from web_ui import start_web_ui
+        from web_ui import run_event_loop, start_web_ui
         
         import argparse
         parser = argparse.ArgumentParser(description="Email Parser & Data Ingestion Web UI")
@@ -29,7 +30,8 @@ def main():
         print("⏹️  Press Ctrl+C to stop")
         print()
         
-        asyncio.run(start_web_ui(args.host, args.port))
+        # Prefer uvloop (shipped with uvicorn[standard]) over the stock event loop
+        run_event_loop(start_web_ui(args.host, args.port))
         
     except KeyboardInterrupt:
         print("\n👋 Web UI stopped")
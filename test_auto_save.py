@@ -4,46 +4,119 @@ Test script to demonstrate auto-save functionality
 Creates sample outputs in organized directories
 """
 
+import io
+import json
+import os
 import subprocess
 import sys
 from pathlib import Path
 
-def run_command(cmd, description):
-    """Run a command and show results"""
-    print(f"\n🔍 {description}")
-    print(f"Running: {' '.join(cmd)}")
-    print("-" * 50)
+class HeadCapture(io.TextIOBase):
+    """Text sink that keeps the first few output lines and only counts the rest"""
+    
+    def __init__(self, keep: int = 10):
+        self.keep = keep
+        self.head = []
+        self.more = 0
+        self._partial = ""
+    
+    def writable(self):
+        return True
+    
+    def write(self, text):
+        if len(self.head) >= self.keep:
+            self.more += text.count("\n")
+            # Once the head is full, only whether a line is still open matters
+            tail = text.rpartition("\n")[2] if "\n" in text else self._partial + text
+            self._partial = tail[:1]
+            return len(text)
+        
+        *lines, self._partial = (self._partial + text).split("\n")
+        for line in lines:
+            self._add_line(line)
+        return len(text)
+    
+    def finish(self):
+        """Count a last line that had no trailing newline"""
+        if self._partial:
+            self._add_line(self._partial)
+            self._partial = ""
+    
+    def _add_line(self, line):
+        if not self.head and not line.strip():
+            return  # skip leading blank lines
+        if len(self.head) < self.keep:
+            self.head.append(line)
+        else:
+            self.more += 1
+
+class CLIBatch:
+    """One `email_cli.py --batch` process; each command is a JSON line in, a JSON line out"""
+    
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "email_cli.py", "--batch"],
+            cwd=Path(__file__).parent,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+    
+    def run(self, args):
+        """Run one CLI command; returns its returncode, stdout and stderr"""
+        self.proc.stdin.write(json.dumps(args) + "\n")
+        self.proc.stdin.flush()
+        for line in self.proc.stdout:
+            if line.startswith("{"):  # skip warnings printed while the CLI imports
+                return json.loads(line)
+        raise RuntimeError("email_cli batch process exited unexpectedly")
+    
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+def run_command(batch, args, description):
+    """Run an email_cli command in the batch process and show results"""
+    # Report lines are collected and written once per command
+    report = [
+        f"\n🔍 {description}",
+        f"Running: email_cli.py {' '.join(args)}",
+        "-" * 50,
+    ]
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=Path(__file__).parent)
+        result = batch.run(args)
         
-        if result.returncode == 0:
-            print("✅ Success!")
-            if result.stdout.strip():
-                # Show first few lines of output
-                lines = result.stdout.strip().split('\n')
-                for line in lines[:10]:
-                    print(f"  {line}")
-                if len(lines) > 10:
-                    print(f"  ... ({len(lines) - 10} more lines)")
+        if result["returncode"] == 0:
+            report.append("✅ Success!")
+            # Show first few lines of output
+            stdout = HeadCapture()
+            stdout.write(result["stdout"])
+            stdout.finish()
+            report.extend(f"  {line}" for line in stdout.head)
+            if stdout.more:
+                report.append(f"  ... ({stdout.more} more lines)")
         else:
-            print("❌ Failed!")
-            print(f"Error: {result.stderr}")
+            report.append("❌ Failed!")
+            report.append(f"Error: {result['stderr']}")
             
     except Exception as e:
-        print(f"❌ Exception: {e}")
+        report.append(f"❌ Exception: {e}")
+    
+    sys.stdout.write("\n".join(report) + "\n")
 
 def main():
     """Test auto-save functionality"""
     print("🚀 Testing Email Parser Auto-Save Functionality")
     print("=" * 60)
     
-    # Activate venv prefix
-    python_cmd = ["python", "email_cli.py"]
+    # All commands run in one CLI process instead of starting an interpreter per command
+    batch = CLIBatch()
     
     # Test 1: Entity extraction with auto-save
     run_command(
-        python_cmd + [
+        batch,
+        [
             "extract-entities",
             "--text", "Contact sales@company.com or call (555) 123-4567. Meeting on 03/15/2024, budget $75,000. Visit https://company.com",
             "--auto-save",
@@ -55,7 +128,8 @@ def main():
     
     # Test 2: Entity extraction with patterns
     run_command(
-        python_cmd + [
+        batch,
+        [
             "extract-entities", 
             "--text", "Email info@support.com for help. Phone: +1-800-555-0199. Due: 12/25/2024",
             "--show-patterns",
@@ -67,9 +141,11 @@ def main():
     
     # Test 3: Demo with auto-save (if it supported it)
     run_command(
-        python_cmd + ["demo", "--type", "basic", "--quiet"],
+        batch,
+        ["demo", "--type", "basic", "--quiet"],
         "Demo functionality"
     )
+    batch.close()
     
     # Show output directory contents
     print(f"\n📁 Output Directory Contents:")
@@ -80,7 +156,9 @@ def main():
         for subdir in ["emails", "analysis", "entities", "reports"]:
             subdir_path = output_dir / subdir
             if subdir_path.exists():
-                files = list(subdir_path.glob("*.json"))
+                # One directory scan; each entry's stat result is cached after first use
+                with os.scandir(subdir_path) as entries:
+                    files = [entry for entry in entries if entry.name.endswith(".json")]
                 print(f"\n📂 {subdir}/")
                 if files:
                     for file in sorted(files, key=lambda x: x.stat().st_mtime, reverse=True):
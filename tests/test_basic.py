@@ -3,20 +3,60 @@
 Debug tests for email parser with detailed output
 """
 
+import io
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
+try:
+    import pytest
+except ImportError:
+    pytest = None  # Still runnable as a plain script
+
+# Without pytest the __main__ runner calls parametrized tests once per case itself
+parametrize = pytest.mark.parametrize if pytest is not None else (lambda names, cases: lambda func: func)
+
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / "src"))
+for path in (str(project_root), str(project_root / "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from email_parser.parser import EmailParser
+
+@lru_cache(maxsize=1)
+def _get_parser():
+    """Shared EmailParser; the tests only read from it"""
+    return EmailParser()
+
+class _StubParser(EmailParser):
+    """Parser whose 'parse' returns the file stem, failing for files named bad*"""
+    
+    def parse_msg_file(self, file_path):
+        if file_path.stem.startswith("bad"):
+            raise RuntimeError(f"cannot parse {file_path.name}")
+        return file_path.stem
+
+# (entity type, expected match, text)
+PATTERN_CASES = [
+    ('emails', 'john@example.com', 'Contact john@example.com today'),
+    ('phones', '555-123-4567', 'Call 555-123-4567 for support'),
+    ('money', '$10,000', 'Budget is $10,000 for this project'),
+    ('urls', 'https://example.com', 'Visit https://example.com for info'),
+    ('dates', '12/31/2024', 'Deadline is 12/31/2024'),
+]
+
+def _pattern_matches(name, text):
+    """Matches of one entity type's compiled pattern"""
+    return [m.group() for m in _get_parser()._compiled_patterns[name].finditer(text)]
 
 def test_import():
     """Test that we can import the parser"""
     try:
-        from email_parser.parser import EmailParser
-        parser = EmailParser()
+        parser = _get_parser()
         assert parser is not None
         assert parser.supported_extensions == ['.msg']
         print("✅ Basic import test passed")
@@ -31,9 +71,7 @@ def test_import():
 def test_entity_patterns_debug():
     """Test entity pattern extraction with debug output"""
     try:
-        from email_parser.parser import EmailParser
-        
-        parser = EmailParser()
+        parser = _get_parser()
         text = "Contact john@example.com or call 555-123-4567. Budget is $10,000."
         
         print(f"📝 Test text: {text}")
@@ -68,47 +106,60 @@ def test_entity_patterns_debug():
         traceback.print_exc()
         return False
 
-def test_individual_patterns():
-    """Test each pattern individually"""
-    try:
-        from email_parser.parser import EmailParser
-        import re
-        
-        parser = EmailParser()
-        
-        test_cases = {
-            'emails': ('john@example.com', 'Contact john@example.com today'),
-            'phones': ('555-123-4567', 'Call 555-123-4567 for support'),
-            'money': ('$10,000', 'Budget is $10,000 for this project'),
-            'urls': ('https://example.com', 'Visit https://example.com for info'),
-            'dates': ('12/31/2024', 'Deadline is 12/31/2024')
-        }
-        
-        print("🧪 Testing individual patterns:")
-        
-        all_passed = True
-        for pattern_name, (expected, test_text) in test_cases.items():
-            pattern = parser.entity_patterns[pattern_name]
-            matches = re.findall(pattern, test_text, re.IGNORECASE)
-            
-            found = expected in matches
-            print(f"  {pattern_name}: {'✅' if found else '❌'} Expected '{expected}', found {matches}")
-            
-            if not found:
-                all_passed = False
-        
-        return all_passed
-        
-    except Exception as e:
-        print(f"❌ Individual pattern test failed: {e}")
-        return False
+@parametrize("name,expected,text", PATTERN_CASES)
+def test_pattern(name, expected, text):
+    """Each entity pattern case, reported separately by pytest"""
+    matches = _pattern_matches(name, text)
+    print(f"  {name}: expected '{expected}', found {matches}")
+    assert expected in matches
+
+def test_overlapping_entities():
+    """Entity types are matched independently, so overlapping matches are all kept"""
+    entities = _get_parser()._extract_entities("text 5551234567@txt.att.net now")
+    
+    assert entities['phones'] == ['5551234567']
+    assert entities['emails'] == ['5551234567@txt.att.net']
+    print(f"✅ Overlapping entity test passed ({entities['phones']}, {entities['emails']})")
+
+def test_tokenize():
+    """Correlation tokens match a plain \\w+ split, Unicode punctuation included"""
+    import re
+    from email_parser.parser import _tokenize
+    
+    for text in ("Q3 report_final: budget, (draft) $10-12!",
+                 "Don’t miss the “Q3” review — it’s due… soon © ACME™"):
+        assert _tokenize(text) == set(re.findall(r'\w+', text.lower())), text
+    print("✅ Tokenize test passed")
+
+def test_keyword_matchers_agree():
+    """The pyahocorasick and regex keyword matchers find the same labels"""
+    from email_parser import parser as parser_module
+    
+    if parser_module.ahocorasick is None:
+        if pytest is not None:
+            pytest.skip("pyahocorasick not installed")
+        print("⏭️  pyahocorasick not installed, skipping")
+        return
+    
+    texts = [
+        "URGENT: follow up on the invoice payment by end of day",
+        "High priority! The conference call is scheduled; billing report attached.",
+        "checking in - followup on the contract terms and signature, eod deadline",
+        "nothing relevant here",
+        "",
+    ]
+    for table in (parser_module._CATEGORY_KEYWORDS, parser_module._PRIORITY_KEYWORDS,
+                  parser_module._KEYWORD_TABLE):
+        automaton = parser_module._build_automaton_matcher(table)
+        regex = parser_module._build_regex_matcher(table)
+        for text in texts:
+            assert automaton(text.lower()) == regex(text.lower()), text
+    print("✅ Keyword matcher agreement test passed")
 
 def test_correlation_calculation():
     """Test correlation calculation"""
     try:
-        from email_parser.parser import EmailParser
-        
-        parser = EmailParser()
+        parser = _get_parser()
         
         # Test high correlation
         subject = "Meeting agenda items"
@@ -127,9 +178,7 @@ def test_correlation_calculation():
 def test_categorization():
     """Test email categorization"""
     try:
-        from email_parser.parser import EmailParser
-        
-        parser = EmailParser()
+        parser = _get_parser()
         
         # Test meeting categorization
         subject = "Weekly team meeting"
@@ -145,12 +194,115 @@ def test_categorization():
         print(f"❌ Email categorization test failed: {e}")
         return False
 
+def test_analyze():
+    """Test that analyze() matches the individual helpers"""
+    parser = _get_parser()
+    attachments = [{'filename': 'agenda.pdf', 'size': 1024}]
+    
+    cases = [
+        ("URGENT: Meeting tomorrow",
+         "Please attend the important meeting tomorrow. Budget is $10,000, contact john@example.com"),
+        # 'İ' lowercases to two characters, so the shared lowercase copy can't be sliced
+        ("İstanbul report", "Results of the İstanbul meeting are attached."),
+    ]
+    for subject, body in cases:
+        analysis = parser.analyze(subject, body, attachments)
+        entities = parser._extract_entities(f"{subject} {body}")
+        
+        assert analysis.extracted_entities == entities
+        assert analysis.categories == parser._categorize_email(subject, body, attachments)
+        assert analysis.correlation_score == parser._calculate_correlation(subject, body, attachments)
+        assert analysis.standardized_format == parser._create_standardized_format(
+            subject, body, attachments, entities
+        )
+    
+    print(f"✅ Analyze test passed (categories: {analysis.categories})")
+
+def test_extract_entities_from_file():
+    """Test memory-mapped entity extraction against the in-memory path"""
+    import tempfile
+    
+    parser = _get_parser()
+    text = "Contact john@example.com or call 555-123-4567. Budget is $10,000 by 12/31/2024."
+    # Latin-1 bytes that are not valid UTF-8 around the entities
+    latin1 = "Caf\xe9 r\xe9sum\xe9: mail john@example.com, tel 555-123-4567".encode("latin-1")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "body.txt"
+        path.write_text(text, encoding="utf-8")
+        from_file = parser.extract_entities_from_file(path)
+        
+        # mmap can't map a zero-length file; it must still return empty results
+        empty = Path(tmp) / "empty.txt"
+        empty.touch()
+        from_empty = parser.extract_entities_from_file(empty)
+        
+        non_utf8 = Path(tmp) / "latin1.txt"
+        non_utf8.write_bytes(latin1)
+        from_non_utf8 = parser.extract_entities_from_file(non_utf8)
+    
+    expected = parser._extract_entities(text)
+    assert {k: set(v) for k, v in from_file.items()} == {k: set(v) for k, v in expected.items()}
+    assert from_empty == {entity_type: [] for entity_type in expected}
+    assert from_non_utf8['emails'] == ['john@example.com']
+    assert from_non_utf8['phones'] == ['555-123-4567']
+    
+    print(f"✅ File entity extraction test passed ({sum(map(len, from_file.values()))} entities)")
+
+def test_action_items():
+    """Action items come back in document order, one per matched span"""
+    parser = _get_parser()
+    
+    # An 'Action required:' item is not also reported as a 'please ...' request
+    assert parser._extract_action_items("Action required: please review the draft.") == [
+        'please review the draft'
+    ]
+    assert parser._extract_action_items(
+        "To do: send it. Could you check the totals? Action item: book the room. Please call Bob."
+    ) == ['send it', 'check the totals', 'book the room']
+    print("✅ Action item test passed")
+
+def test_parse_msg_files():
+    """Batch parsing keeps input order and records failures per file"""
+    names = ["a.msg", "bad1.msg", "b.msg", "c.msg", "bad2.msg", "d.msg"]
+    expected = ["a", None, "b", "c", None, "d"]
+    
+    # The stub never opens the files, so the paths need not exist
+    assert _StubParser().parse_msg_files(names, max_workers=2) == expected
+    assert _StubParser().parse_msg_files(names, max_workers=1) == expected
+    print("✅ Batch parse test passed")
+
+def test_cli_batch():
+    """email_cli --batch answers every line, carrying on past malformed and failing ones"""
+    import json
+    import subprocess
+    
+    lines = [
+        json.dumps(["extract-entities", "--text", "mail john@example.com", "--quiet"]),
+        "not json",
+        json.dumps({"not": "a list"}),
+        json.dumps(["no-such-command"]),
+        json.dumps(["extract-entities", "--text", "call 555-123-4567", "--quiet"]),
+    ]
+    proc = subprocess.run(
+        [sys.executable, "email_cli.py", "--batch"],
+        cwd=project_root, input="\n".join(lines) + "\n",
+        capture_output=True, text=True, timeout=120
+    )
+    assert proc.returncode == 0, proc.stderr
+    
+    # Import-time warnings may precede the JSON responses
+    responses = [json.loads(line) for line in proc.stdout.splitlines() if line.startswith("{")]
+    assert [r["returncode"] for r in responses] == [0, 1, 1, 2, 0]
+    assert "john@example.com" in responses[0]["stdout"]
+    assert "JSON lists" in responses[1]["stderr"] and "JSON lists" in responses[2]["stderr"]
+    assert "555-123-4567" in responses[4]["stdout"]
+    print("✅ CLI batch test passed")
+
 def test_full_parsing_workflow():
     """Test the complete parsing workflow without .msg file"""
     try:
-        from email_parser.parser import EmailParser
-        
-        parser = EmailParser()
+        parser = _get_parser()
         
         # Test all the helper methods
         print("🔄 Testing full workflow components:")
@@ -192,34 +344,79 @@ def test_full_parsing_workflow():
         traceback.print_exc()
         return False
 
+class ThreadLocalOutput(io.TextIOBase):
+    """stdout stand-in that sends each thread's prints to that thread's own buffer"""
+    
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.local = threading.local()
+    
+    def writable(self):
+        return True
+    
+    def write(self, text):
+        return getattr(self.local, "buffer", self.fallback).write(text)
+
+def run_captured(test_name, test_func, output):
+    """Run one test with its output collected; returns (passed, output text)"""
+    buf = output.local.buffer = io.StringIO()
+    try:
+        print(f"\n🧪 Running: {test_name}")
+        print("-" * 30)
+        try:
+            result = test_func()
+            # Newer tests just assert (returning None); older ones return True/False
+            ok = result is None or bool(result)
+            print(f"✅ {test_name} PASSED" if ok else f"❌ {test_name} FAILED")
+        except Exception as e:
+            print(f"💥 {test_name} CRASHED: {e}")
+            ok = False
+    finally:
+        del output.local.buffer
+    return ok, buf.getvalue()
+
 if __name__ == "__main__":
     print("🔬 Email Parser Debug Tests")
     print("=" * 50)
     
     tests = [
         ("Import Test", test_import),
-        ("Individual Patterns", test_individual_patterns),
+        *((f"Pattern: {name}", partial(test_pattern, name, expected, text))
+          for name, expected, text in PATTERN_CASES),
         ("Entity Extraction Debug", test_entity_patterns_debug),
+        ("Overlapping Entities", test_overlapping_entities),
+        ("Tokenize", test_tokenize),
+        ("Keyword Matchers", test_keyword_matchers_agree),
         ("Correlation Calculation", test_correlation_calculation),
         ("Email Categorization", test_categorization),
+        ("Analyze", test_analyze),
+        ("File Entity Extraction", test_extract_entities_from_file),
+        ("Action Items", test_action_items),
+        ("Batch Parsing", test_parse_msg_files),
+        ("CLI Batch", test_cli_batch),
         ("Full Workflow", test_full_parsing_workflow),
     ]
     
     passed = 0
     failed = 0
     
-    for test_name, test_func in tests:
-        print(f"\n🧪 Running: {test_name}")
-        print("-" * 30)
-        try:
-            if test_func():
-                passed += 1
-                print(f"✅ {test_name} PASSED")
-            else:
-                failed += 1
-                print(f"❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"💥 {test_name} CRASHED: {e}")
+    # The tests share no mutable state, so run them concurrently; each test's
+    # output is collected separately and written in the original order
+    output = ThreadLocalOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(run_captured, test_name, test_func, output)
+                       for test_name, test_func in tests]
+            results = [future.result() for future in futures]
+    finally:
+        sys.stdout = output.fallback
+    
+    for ok, test_output in results:
+        sys.stdout.write(test_output)
+        if ok:
+            passed += 1
+        else:
             failed += 1
     
     print("\n" + "=" * 50)